@@ -83,6 +83,12 @@ Examples:
         help='Maximum concurrent requests (default: 5)'
     )
 
+    parser.add_argument(
+        '--http-cache',
+        metavar='PATH',
+        help='Cache HTTP responses in this SQLite file to speed up reruns'
+    )
+
     parser.add_argument(
         '--debug',
         action='store_true',
@@ -107,7 +113,7 @@ def load_stores_from_file(filepath: str) -> List[str]:
     return stores
 
 
-def print_results_summary(results):
+def print_results_summary(summaries):
     """Print a summary table of extraction results."""
     table = Table(title="Extraction Results Summary")
     table.add_column("Store", style="cyan")
@@ -118,14 +124,14 @@ def print_results_summary(results):
     total_products = 0
     total_errors = 0
 
-    for result in results:
-        products_count = len(result.products)
-        errors_count = len(result.errors)
+    for summary in summaries:
+        products_count = summary.product_count
+        errors_count = summary.error_count
         total_products += products_count
         total_errors += errors_count
 
         table.add_row(
-            result.store_name,
+            summary.store_name,
             str(products_count),
             str(products_count),  # All products have size charts
             str(errors_count) if errors_count > 0 else "-"
@@ -165,7 +171,8 @@ async def main_async():
         max_products_per_store=args.max_products,
         rate_limit_delay=args.rate_limit,
         timeout=args.timeout,
-        concurrent_requests=args.concurrent
+        concurrent_requests=args.concurrent,
+        http_cache=args.http_cache
     )
 
     service = SizeChartExtractorService(config)
@@ -178,7 +185,7 @@ async def main_async():
         task = progress.add_task("Extracting size charts...", total=None)
 
         try:
-            results = await service.run(stores, args.output)
+            summaries = await service.run(stores, args.output)
             progress.update(task, completed=True)
         except Exception as e:
             console.print(f"[red]Extraction failed: {e}[/red]")
@@ -187,7 +194,7 @@ async def main_async():
             sys.exit(1)
 
     console.print(f"\n[green]✓ Results saved to {args.output}[/green]\n")
-    print_results_summary(results)
+    print_results_summary(summaries)
 
 
 def main():
@@ -1,12 +1,12 @@
+import asyncio
 from datetime import datetime, UTC
 import re
-import json
 import logging
+import ijson
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any, Tuple
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
-from pydantic import HttpUrl
+from lxml import etree
 
 from ..models.size_chart import Product, SizeChart, StoreResult
 from ..utils.http_client import HTTPClient
@@ -15,6 +15,15 @@ from ..utils.rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+SITEMAP_LOC_TAG = '{http://www.sitemaps.org/schemas/sitemap/0.9}loc'
+SITEMAP_SUFFIXES = ('.xml', '.xml.gz')
+PRODUCT_URL_RE = re.compile(r'/products/[^/?#]+')
+
+
+def _is_sitemap_url(url: str) -> bool:
+    # Shopify child sitemaps carry a query string, e.g. sitemap_products_1.xml?from=1
+    return url.split('?', 1)[0].endswith(SITEMAP_SUFFIXES)
+
 
 class BaseExtractor(ABC):
 
@@ -23,7 +32,8 @@ class BaseExtractor(ABC):
         store_url: str,
         http_client: HTTPClient,
         rate_limiter: RateLimiter,
-        max_products: int = 100
+        max_products: int = 100,
+        concurrent_requests: int = 1
     ):
 
         self.store_url = store_url.strip('/')
@@ -33,7 +43,10 @@ class BaseExtractor(ABC):
         self.http_client = http_client
         self.rate_limiter = rate_limiter
         self.max_products = max_products
+        self.concurrent_requests = concurrent_requests
+        self._sem = asyncio.Semaphore(concurrent_requests)
         self.parser = SizeChartParser()
+        self._title_cache: Dict[str, str] = {}
 
 
     @abstractmethod
@@ -42,6 +55,10 @@ class BaseExtractor(ABC):
 
 
     async def extract_title(self, product_url: str) -> Optional[str]:
+        title = self._title_cache.get(product_url)
+        if title:
+            return title
+
         json_url = f'{product_url}.json'
         async with self.rate_limiter:
             data = await self.http_client.get_json(json_url)
@@ -54,12 +71,10 @@ class BaseExtractor(ABC):
         try:
             url = urljoin(self.store_url, '/collections.json')
             async with self.rate_limiter:
-                data = await self.http_client.get_json(url)
-                if 'collections' in data:
-                    for collection in data['collections']:
-                        handle = collection.get('handle')
+                async with self.http_client.stream(url) as body:
+                    async for handle in ijson.items_async(body, 'collections.item.handle'):
                         if handle:
-                            collections.append(urljoin(self.store_url,f'/collections/{handle}'))
+                            collections.append(urljoin(self.store_url, f'/collections/{handle}'))
         except Exception as e:
             logger.debug(f"Failed to get collections from /collections.json: {e}")
 
@@ -73,43 +88,54 @@ class BaseExtractor(ABC):
         while len(products) < self.max_products:
             try:
                 url = f"{self.store_url}/products.json?page={page}&limit=250"
+                page_count = 0
                 async with self.rate_limiter:
-                    data = await self.http_client.get_json(url)
-                
-                page_products = data.get('products', [])
-                
-                if not page_products:
-                    break
-                
-                for product in page_products:
-                    if len(products) < self.max_products:
-                        products.append(product)
-                    else:
-                        break
-                
-                if len(page_products) < 250:
+                    async with self.http_client.stream(url) as body:
+                        async for product in ijson.items_async(body, 'products.item'):
+                            page_count += 1
+                            handle = product.get('handle')
+                            title = product.get('title')
+                            products.append({'handle': handle, 'title': title})
+                            if handle and title:
+                                product_url = urljoin(self.store_url, f'/products/{handle}')
+                                self._title_cache[product_url] = title
+
+                            if len(products) >= self.max_products:
+                                break
+
+                if page_count < 250:
                     break
-                
+
                 page += 1
-                
+
             except Exception as e:
                 logger.warning(f"Failed to get products.json page {page}: {e}")
                 break
-        
+
         logger.info(f"Retrieved {len(products)} products from products.json API")
         return products
 
 
     async def get_product_urls(self) -> List[str]:
         product_urls = []
+        seen = set()
+
+        def add(urls: List[str]) -> bool:
+            """Append unseen URLs in order; return True once max_products is reached."""
+            for url in urls:
+                if url not in seen:
+                    seen.add(url)
+                    product_urls.append(url)
+                    if len(product_urls) >= self.max_products:
+                        return True
+            return False
 
         try:
             products = await self.get_shopify_products_json()
-            for product in products:
-                handle = product.get('handle')
-                if handle:
-                    url = urljoin(self.store_url, f'/products/{handle}')
-                    product_urls.append(url)
+            add([
+                urljoin(self.store_url, f'/products/{product["handle"]}')
+                for product in products if product.get('handle')
+            ])
 
             if product_urls:
                 logger.info(f"Found {len(product_urls)} products via products.json")
@@ -121,45 +147,46 @@ class BaseExtractor(ABC):
             collections = await self.get_collections()
             logger.info(f"Found {len(collections)} collections")
 
-            for collection_url in collections[:10]:
-                try:
-                    collection_products = await self._get_products_from_collection(collection_url)
-                    product_urls.extend(collection_products)
-
-                    if len(product_urls) >= self.max_products:
-                        break
-
-                except Exception as e:
+            collections = collections[:10]
+            results = await asyncio.gather(
+                *[self._get_products_from_collection(c) for c in collections],
+                return_exceptions=True
+            )
+            for collection_url, result in zip(collections, results):
+                if isinstance(result, BaseException):
                     logger.warning(
-                        f"Failed to get products from {collection_url}: {e}")
+                        f"Failed to get products from {collection_url}: {result}")
+                    continue
+
+                if add(result):
+                    break
 
         except Exception as e:
             logger.warning(f"Failed to get collections: {e}")
 
         if not product_urls:
             try:
-                sitemap_urls = await self._get_products_from_sitemap()
-                product_urls.extend(sitemap_urls)
+                add(await self._get_products_from_sitemap())
             except Exception as e:
                 logger.warning(f"Failed to get products from sitemap: {e}")
 
-        product_urls = list(dict.fromkeys(product_urls))
-
-        return product_urls[:self.max_products]
+        return product_urls
 
     async def _get_products_from_collection(self, collection_url: str) -> List[str]:
         products = []
+        seen = set()
 
         try:
             json_url = f"{collection_url}/products.json"
-            async with self.rate_limiter:
-                data = await self.http_client.get_json(json_url)
-
-            for product in data.get('products', []):
-                handle = product.get('handle')
-                if handle:
-                    url = urljoin(self.store_url, f'/products/{handle}')
-                    products.append(url)
+            async with self._sem, self.rate_limiter:
+                async with self.http_client.stream(json_url) as body:
+                    async for handle in ijson.items_async(body, 'products.item.handle'):
+                        if handle and handle not in seen:
+                            seen.add(handle)
+                            url = urljoin(self.store_url, f'/products/{handle}')
+                            products.append(url)
+                            if len(products) >= self.max_products:
+                                break
 
         except Exception as e:
             logger.debug(f"Failed to get products from {collection_url}: {e}")
@@ -167,36 +194,59 @@ class BaseExtractor(ABC):
 
         return products
 
-    async def _get_products_from_sitemap(self) -> List[str]:    
-        products = []
-        sitemap_urls = []
-        parent_xml = urljoin(self.store_url, '/sitemap.xml')
-        async with self.rate_limiter:
-            xml = await self.http_client.get(parent_xml)
-        soup = BeautifulSoup(xml, 'xml')
+    async def _get_sitemap_locs(self, sitemap_url: str, keep: Callable[[str], Any]) -> List[str]:
+        """Stream a sitemap and return the <loc> entries accepted by ``keep``."""
+        locs = []
+        parser = etree.XMLPullParser(events=('end',), tag=SITEMAP_LOC_TAG)
+
+        def drain():
+            for _, elem in parser.read_events():
+                if elem.text:
+                    url = elem.text.strip()
+                    if keep(url):
+                        locs.append(url)
+                # Drop processed entries so memory stays flat on large sitemaps
+                entry = elem.getparent()
+                elem.clear()
+                if entry is not None:
+                    while entry.getprevious() is not None:
+                        del entry.getparent()[0]
 
-        for loc in soup.find_all('loc'):
-            url  = loc.get_text()
-            if '.xml' in url:
-                sitemap_urls.append(url)
-        
+        async with self.rate_limiter:
+            async with self.http_client.stream(sitemap_url) as body:
+                async for chunk in body.iter_chunked(64 * 1024):
+                    parser.feed(chunk)
+                    drain()
+        parser.close()
+        drain()
 
-        try:
-            for sitemap_url in sitemap_urls:
-                async with self.rate_limiter:
-                    xml = await self.http_client.get(sitemap_url)
-                soup = BeautifulSoup(xml, 'xml')
+        return locs
 
-                for loc in soup.find_all('loc'):
-                    url = loc.get_text()
-                    if '/products/' in url:
-                        products.append(url)
+    async def _get_products_from_sitemap(self) -> List[str]:
+        products = []
+        parent_xml = urljoin(self.store_url, '/sitemap.xml')
+        sitemap_urls = await self._get_sitemap_locs(parent_xml, _is_sitemap_url)
 
-        except Exception as e:
-            logger.debug(f"Failed to get sitemap: {e}")
+        results = await asyncio.gather(
+            *[self._fetch_sitemap(url) for url in sitemap_urls],
+            return_exceptions=True
+        )
+        seen = set()
+        for sitemap_url, result in zip(sitemap_urls, results):
+            if isinstance(result, BaseException):
+                logger.debug(f"Failed to get sitemap {sitemap_url}: {result}")
+                continue
+            for url in result:
+                if url not in seen:
+                    seen.add(url)
+                    products.append(url)
 
         return products
 
+    async def _fetch_sitemap(self, sitemap_url: str) -> List[str]:
+        async with self._sem:
+            return await self._get_sitemap_locs(sitemap_url, PRODUCT_URL_RE.search)
+
     async def extract_all(self) -> StoreResult:
         products = []
         errors = []
@@ -206,17 +256,25 @@ class BaseExtractor(ABC):
             product_urls = await self.get_product_urls()
             logger.info(f"Found {len(product_urls)} products for {self.store_url}")
 
-            for i, url in enumerate(product_urls):
-                try:
-                    async with self.rate_limiter:
+            async def _one(i: int, url: str) -> Tuple[Optional[Product], Optional[str]]:
+                async with self._sem:
+                    try:
                         logger.debug(f"Extracting {i+1}/{len(product_urls)}: {url}")
-                        product = await self.extract_size_chart(url)
-                        if product and product.size_chart:
-                            products.append(product)
-                except Exception as e:
-                    error_msg = f"Error extracting {url}: {str(e)}"
-                    logger.error(error_msg)
+                        return await self.extract_size_chart(url), None
+                    except Exception as e:
+                        error_msg = f"Error extracting {url}: {str(e)}"
+                        logger.error(error_msg)
+                        return None, error_msg
+
+            # Products and errors keep URL order whatever order they finish in
+            results = await asyncio.gather(
+                *[_one(i, url) for i, url in enumerate(product_urls)]
+            )
+            for product, error_msg in results:
+                if error_msg:
                     errors.append(error_msg)
+                elif product and product.size_chart:
+                    products.append(product)
 
         except Exception as e:
             error_msg = f"Error getting product URLs: {str(e)}"
@@ -232,7 +290,7 @@ class BaseExtractor(ABC):
 
     async def extract_product_data_from_html(self, html: str, url: str) -> Optional[Product]:
 
-        soup = BeautifulSoup(html, 'lxml')
+        tree = self.parser.parse_html(html)
 
         title = await self.extract_title(url)
 
@@ -240,21 +298,20 @@ class BaseExtractor(ABC):
             logger.warning(f"Could not extract title from {url}")
             return None
 
-        potential_charts = self.parser.find_size_charts(soup)
+        potential_charts = self.parser.iter_size_charts(tree) if tree is not None else ()
 
-        if potential_charts:
-            table, confidence = potential_charts[0]
+        for table, confidence in potential_charts:
             headers, rows = self.parser.extract_table_data(table)
 
             if headers and rows:
                 logger.info(
                     f"Found size chart for {title} (confidence: {confidence:.2f})")
-                return Product(
+                return Product.model_construct(
                     product_title=title,
-                    product_url=HttpUrl(url),
-                    size_chart=SizeChart(headers=headers, rows=rows)
+                    product_url=url,
+                    size_chart=SizeChart.model_construct(headers=headers, rows=rows)
                 )
-        else:
-            logger.warning(f"Could not find size chart for {title} or it doesnt exist")
+
+        logger.warning(f"Could not find size chart for {title} or it doesnt exist")
 
         return None
@@ -25,6 +25,18 @@ class ExtractorFactory:
         'www.suqah.com': SuqahExtractor,
     }
 
+    @staticmethod
+    def normalize_domain(store_url: str) -> str:
+        """Reduce a store URL to the www. host the extractors talk to."""
+        store_domain = store_url.lower().strip('/')
+        if store_domain.startswith('http://'):
+            store_domain = store_domain[7:]
+        elif store_domain.startswith('https://'):
+            store_domain = store_domain[8:]
+        if not store_domain.startswith('www.'):
+            store_domain = 'www.' + store_domain
+        return store_domain
+
     @classmethod
     def create_extractor(
         cls,
@@ -35,14 +47,7 @@ class ExtractorFactory:
         concurrent_requests: int = 1
     ) -> BaseExtractor:
 
-        store_domain = store_url.lower().strip('/')
-        if store_domain.startswith('http://'):
-            store_domain = store_domain[7:]
-        elif store_domain.startswith('https://'):
-            store_domain = store_domain[8:]
-        if not store_domain.startswith('www.'):
-            store_domain = 'www.' + store_domain
-
+        store_domain = cls.normalize_domain(store_url)
 
         extractor_class = cls.EXTRACTORS.get(store_domain)
         if not extractor_class:
@@ -55,5 +60,5 @@ class ExtractorFactory:
             http_client=http_client,
             rate_limiter=rate_limiter,
             max_products=max_products,
-            # concurrent_requests=concurrent_requests
+            concurrent_requests=concurrent_requests
         )
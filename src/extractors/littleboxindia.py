@@ -3,7 +3,7 @@ from typing import Optional
 
 from .base import BaseExtractor
 from ..models.size_chart import Product, StoreResult
-from ..utils.selenium_client import SeleniumClient
+from ..utils.browser import create_browser_client
 
 logger = logging.getLogger(__name__)
 
@@ -13,24 +13,24 @@ class LittleBoxIndiaExtractor(BaseExtractor):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.selenium_client = SeleniumClient(
+        self.browser = create_browser_client(
             headless=True,
             timeout=30,
             page_load_timeout=30,
-            wait_for_element="#KiwiSizingChart"  # Wait for KiwiSizing to load
+            wait_for_element="#KiwiSizingChart",  # Wait for KiwiSizing to load
+            pool_size=self.concurrent_requests
         )
 
     async def extract_size_chart(self, product_url: str) -> Optional[Product]:
         """Extract size chart from LittleBoxIndia product page."""
         try:
-            html = await self.selenium_client.get_rendered_html(product_url)
+            async with self.rate_limiter:
+                html = await self.browser.get_rendered_html(product_url)
             return await self.extract_product_data_from_html(html, product_url)
 
         except Exception as e:
             logger.error(f"Failed to extract from {product_url}: {e}")
             return None
-        finally:
-            await self.selenium_client.close()
 
     async def extract_all(self) -> StoreResult:
         try:
@@ -41,4 +41,4 @@ class LittleBoxIndiaExtractor(BaseExtractor):
 
     async def close(self):
         """Clean up resources."""
-        await self.selenium_client.close()
+        await self.browser.close()
@@ -1,31 +1,35 @@
 import logging
 import os
 from typing import Optional
-from bs4 import BeautifulSoup, Tag
-from pydantic import HttpUrl
+import lxml.html
+from lxml.cssselect import CSSSelector
 
 from src.utils.gemini_extractor import GeminiSizeChartExtractor
 
 from .base import BaseExtractor
 from ..models.size_chart import Product, StoreResult
-from ..utils.selenium_client import SeleniumClient
+from ..utils.browser import create_browser_client
 
 logger = logging.getLogger(__name__)
 
+SIZE_CHART_IMG = CSSSelector('figure img')
+
 
 class SuqahExtractor(BaseExtractor):
     """Extractor for Suqah using Selenium for JavaScript rendering."""
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.selenium_client = SeleniumClient(
+        self.browser = create_browser_client(
             headless=True,
             timeout=30,
             page_load_timeout=30,
-            wait_for_element="figure"
+            wait_for_element="figure",
+            pool_size=self.concurrent_requests
         )
         self.gemini_extractor = GeminiSizeChartExtractor(
             api_key=os.environ.get("GEMINI_API_KEY", ""),
+            http_client=self.http_client,
             model_name="gemini-2.5-flash"
         )
 
@@ -36,18 +40,19 @@ class SuqahExtractor(BaseExtractor):
                 logger.warning(f"Could not extract title from {product_url}")
                 return None
 
-            html = await self.selenium_client.get_rendered_html(product_url)
-            soup = BeautifulSoup(html, 'lxml')
+            async with self.rate_limiter:
+                html = await self.browser.get_rendered_html(product_url)
+            tree = lxml.html.fromstring(html)
+            imgs = SIZE_CHART_IMG(tree)
+            src = imgs[0].get('src') if imgs else None
+            size_chart = None
 
-            figure = soup.find('figure')
-            if figure and isinstance(figure, Tag):
-                img = figure.find('img')
-                if img and isinstance(img, Tag) and img.get('src'):
-                    size_chart = await self.gemini_extractor.extract_table(str(img['src']))
+            if src:
+                size_chart = await self.gemini_extractor.extract_table(src)
 
-            return Product(
+            return Product.model_construct(
                 product_title=title,
-                product_url=HttpUrl(product_url),
+                product_url=product_url,
                 size_chart=size_chart
             )
 
@@ -63,4 +68,4 @@ class SuqahExtractor(BaseExtractor):
             await self.close()
 
     async def close(self):
-        await self.selenium_client.close()
+        await self.browser.close()
@@ -28,14 +28,27 @@ class StoreResult(BaseModel):
     errors: List[str] = Field(default_factory=list,description="Any errors encountered")
 
 
+class StoreSummary(BaseModel):
+    """Per-store counts kept once a store's full result has been written out."""
+    store_name: str = Field(..., description="Store domain name")
+    product_count: int = Field(0, description="Products with size charts")
+    error_count: int = Field(0, description="Errors encountered")
+
+
 class ExtractionConfig(BaseModel):
     """Configuration for extraction process."""
     max_products_per_store: int = Field(default=100, description="Maximum products to extract per store")
     rate_limit_delay: float = Field(default=1.0, description="Delay between requests in seconds")
     timeout: int = Field(default=30, description="Request timeout in seconds")
     concurrent_requests: int = Field(default=5, description="Maximum concurrent requests")
-    max_retries: int = Field(default=1, description="Maximum retry attempts")
+    max_retries: int = Field(default=2, description="Retries after a failed first attempt, so each request is tried up to max_retries + 1 times")
     user_agent: Optional[str] = Field(default=None, description="User agent string")
+    http_cache: Optional[str] = Field(default=None, description="Path of an on-disk HTTP response cache; disabled when unset")
+
+    @property
+    def requests_per_second(self) -> float:
+        """Request rate implied by ``rate_limit_delay``; 0 means unlimited."""
+        return 1.0 / self.rate_limit_delay if self.rate_limit_delay > 0 else 0.0
 
 
 class KeyValuePair(BaseModel):
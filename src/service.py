@@ -1,119 +1,230 @@
 import asyncio
-import json
 import logging
 from datetime import datetime, UTC
-from typing import List
+from typing import Any, AsyncIterator, BinaryIO, Dict, Iterable, List, Optional
 from pathlib import Path
 
-from .models.size_chart import ExtractionConfig, StoreResult
+import orjson
+from aiohttp import ClientTimeout
+
+from .models.size_chart import ExtractionConfig, StoreResult, StoreSummary
 from .extractors.factory import ExtractorFactory
 from .utils.http_client import HTTPClient
 from .utils.rate_limiter import RateLimiter
+from .utils.response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
+# Pre-warming only saves handshakes; never let a slow host hold up the run
+PREWARM_TIMEOUT = ClientTimeout(total=3)
+
+
+class ResultWriter:
+    """Write store results to disk one at a time as they arrive.
+
+    ``.jsonl`` paths get one store per line; anything else gets the usual
+    indented JSON array, produced without building the whole document first.
+    """
+
+    def __init__(self, output_path: str = "output.json"):
+        self.output_file = Path(output_path)
+        self.json_lines = self.output_file.suffix == '.jsonl'
+        self.count = 0
+        self._file: Optional[BinaryIO] = None
+
+    def __enter__(self) -> "ResultWriter":
+        self.output_file.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.output_file, 'wb')
+        if not self.json_lines:
+            self._file.write(b'[')
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if not self.json_lines:
+            self._file.write(b'\n]' if self.count else b']')
+        self._file.close()
+        logger.info(f"Results saved to {self.output_file}")
+
+    @staticmethod
+    def store_to_dict(result: StoreResult) -> Dict[str, Any]:
+        store_data = {
+            "store_name": result.store_name,
+            "extraction_date": result.extraction_date,
+            "products": [
+                {
+                    "product_title": product.product_title,
+                    "product_url": str(product.product_url),
+                    "size_chart": {
+                        "headers": product.size_chart.headers,
+                        "rows": product.size_chart.rows
+                    }
+                }
+                for product in result.products
+                if product.size_chart
+            ]
+        }
+
+        if result.errors:
+            store_data["errors"] = result.errors
+
+        return store_data
+
+    def write(self, result: StoreResult):
+        store_data = self.store_to_dict(result)
+        if self.json_lines:
+            self._file.write(orjson.dumps(store_data, option=orjson.OPT_APPEND_NEWLINE))
+        else:
+            # Nest each store one level inside the enclosing array
+            store_json = orjson.dumps(store_data, option=orjson.OPT_INDENT_2)
+            self._file.write(b',\n  ' if self.count else b'\n  ')
+            self._file.write(store_json.replace(b'\n', b'\n  '))
+        self._file.flush()
+        self.count += 1
+
 
 class SizeChartExtractorService:
 
     def __init__(self, config: ExtractionConfig):
         self.config = config or ExtractionConfig()
+        self.cache = ResponseCache(self.config.http_cache) if self.config.http_cache else None
+        # One pooled session shared by every store for the whole run
+        self.http_client = HTTPClient(
+            timeout=self.config.timeout,
+            max_retries=self.config.max_retries,
+            user_agent=self.config.user_agent,
+            per_host_limit=self.config.concurrent_requests,
+            cache=self.cache
+        )
+
+    async def aclose(self):
+        """Close the shared HTTP session and the response cache."""
+        try:
+            await self.http_client.aclose()
+        finally:
+            if self.cache:
+                self.cache.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
 
     async def extract_store(self, store_url: str) -> StoreResult:
         logger.info(f"Starting extraction for {store_url}")
 
         rate_limiter = RateLimiter(
-            rate_limit=self.config.rate_limit_delay,
+            requests_per_second=self.config.requests_per_second,
         )
 
-        async with HTTPClient(
-            timeout=self.config.timeout,
-            max_retries=self.config.max_retries,
-            user_agent=self.config.user_agent
-        ) as http_client:
-            extractor = ExtractorFactory.create_extractor(
-                store_url=store_url,
-                http_client=http_client,
-                rate_limiter=rate_limiter,
-                max_products=self.config.max_products_per_store
-            )
-
-            result = await extractor.extract_all()
-            result.extraction_date = datetime.now(UTC).isoformat()
-
-            logger.info(
-                f"Completed extraction for {store_url}: "
-                f"{len(result.products)} products with size charts found"
-            )
-
-            return result
-
-    async def extract_stores(self, store_urls: List[str]) -> List[StoreResult]:
-        semaphore = asyncio.Semaphore(self.config.concurrent_requests)
-
-        async def extract_with_semaphore(store_url: str) -> StoreResult:
-            async with semaphore:
-                try:
-                    return await self.extract_store(store_url)
-                except Exception as e:
-                    logger.error(f"Failed to extract {store_url}: {e}")
-                    return StoreResult(
-                        store_name=store_url,
-                        products=[],
-                        errors=[f"Extraction failed: {str(e)}"],
-                        extraction_date=datetime.now(UTC).isoformat()
-                    )
-
-        tasks = [extract_with_semaphore(url) for url in store_urls]
-        results = await asyncio.gather(*tasks)
-
-        return results
-
-    def save_results(self, results: List[StoreResult], output_path: str = "output.json"):
-        output_data = []
-        for result in results:
-            store_data = {
-                "store_name": result.store_name,
-                "extraction_date": result.extraction_date,
-                "products": []
-            }
-
-            for product in result.products:
-                if product.size_chart:
-                    product_data = {
-                        "product_title": product.product_title,
-                        "product_url": str(product.product_url),
-                        "size_chart": {
-                            "headers": product.size_chart.headers,
-                            "rows": product.size_chart.rows
-                        }
-                    }
-                    store_data["products"].append(product_data)
+        extractor = ExtractorFactory.create_extractor(
+            store_url=store_url,
+            http_client=self.http_client,
+            rate_limiter=rate_limiter,
+            max_products=self.config.max_products_per_store,
+            concurrent_requests=self.config.concurrent_requests
+        )
 
-            if result.errors:
-                store_data["errors"] = result.errors
+        result = await extractor.extract_all()
+        result.extraction_date = datetime.now(UTC).isoformat()
 
-            output_data.append(store_data)
+        logger.info(
+            f"Completed extraction for {store_url}: "
+            f"{len(result.products)} products with size charts found"
+        )
 
-        output_file = Path(output_path)
-        output_file.parent.mkdir(parents=True, exist_ok=True)
+        return result
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+    async def prewarm(self, store_urls: List[str]):
+        """Open a keep-alive connection to each store host before extraction.
 
-        logger.info(f"Results saved to {output_file}")
+        DNS and TLS handshakes for every store then overlap instead of each
+        store paying for them on its first request. Each HEAD gets a single
+        short attempt, so an unreachable host delays the run by seconds at
+        most.
+        """
+        hosts = {ExtractorFactory.normalize_domain(url) for url in store_urls}
+        await asyncio.gather(
+            *[self.http_client.head(f'https://{host}/', timeout=PREWARM_TIMEOUT) for host in hosts],
+            return_exceptions=True
+        )
 
-    async def run(self, store_urls: List[str], output_path: str = "output.json") -> List[StoreResult]:
-        results = await self.extract_stores(store_urls)  # type: ignore # TODO: fix this
+    async def _extract_store_safely(self, store_url: str) -> StoreResult:
+        try:
+            return await self.extract_store(store_url)
+        except Exception as e:
+            logger.error(f"Failed to extract {store_url}: {e}")
+            return StoreResult(
+                store_name=store_url,
+                products=[],
+                errors=[f"Extraction failed: {str(e)}"],
+                extraction_date=datetime.now(UTC).isoformat()
+            )
 
-        self.save_results(results, output_path)
+    async def iter_stores(self, store_urls: List[str]) -> AsyncIterator[StoreResult]:
+        """Yield store results in completion order.
+
+        A fixed pool of ``concurrent_requests`` workers pulls URLs from a
+        queue, and finished results wait in a queue of the same size, so only
+        a bounded number of stores are in memory at once however long the
+        URL list is.
+        """
+        pending: asyncio.Queue = asyncio.Queue()
+        for url in store_urls:
+            pending.put_nowait(url)
+        finished: asyncio.Queue = asyncio.Queue(maxsize=self.config.concurrent_requests)
+
+        async def worker():
+            while not pending.empty():
+                url = pending.get_nowait()
+                await finished.put(await self._extract_store_safely(url))
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(self.config.concurrent_requests, len(store_urls)))
+        ]
+        try:
+            for _ in store_urls:
+                yield await finished.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
 
-        total_products = sum(len(r.products) for r in results)
-        total_errors = sum(len(r.errors) for r in results)
+    async def extract_stores(self, store_urls: List[str]) -> List[StoreResult]:
+        return [result async for result in self.iter_stores(store_urls)]
+
+    def save_results(self, results: Iterable[StoreResult], output_path: str = "output.json"):
+        with ResultWriter(output_path) as writer:
+            for result in results:
+                writer.write(result)
+
+    async def run(self, store_urls: List[str], output_path: str = "output.json") -> List[StoreSummary]:
+        """Extract every store to ``output_path`` and return per-store counts.
+
+        Full results are dropped once written, so memory does not grow with
+        the number of stores.
+        """
+        summaries = []
+        async with self:
+            await self.prewarm(store_urls)
+            # Each store is on disk as soon as it finishes
+            with ResultWriter(output_path) as writer:
+                async for result in self.iter_stores(store_urls):
+                    writer.write(result)
+                    summaries.append(StoreSummary(
+                        store_name=result.store_name,
+                        product_count=len(result.products),
+                        error_count=len(result.errors)
+                    ))
+
+        total_products = sum(s.product_count for s in summaries)
+        total_errors = sum(s.error_count for s in summaries)
 
         logger.info(
-            f"Extraction complete: {len(results)} stores, "
+            f"Extraction complete: {len(summaries)} stores, "
             f"{total_products} products with size charts, "
             f"{total_errors} errors"
         )
 
-        return results
+        return summaries
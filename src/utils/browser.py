@@ -0,0 +1,16 @@
+import os
+from typing import Union
+
+from .playwright_client import PlaywrightClient
+from .selenium_client import SeleniumClient
+
+
+def create_browser_client(**kwargs) -> Union[SeleniumClient, PlaywrightClient]:
+    """Return the rendered-HTML client chosen by ``BROWSER_BACKEND``.
+
+    Defaults to Selenium; set ``BROWSER_BACKEND=playwright`` to use the
+    Playwright client instead. Both accept the same keyword arguments.
+    """
+    if os.environ.get("BROWSER_BACKEND", "selenium").lower() == "playwright":
+        return PlaywrightClient(**kwargs)
+    return SeleniumClient(**kwargs)
@@ -3,24 +3,109 @@ Gemini 2.5 Flash integration for extracting structured size chart data from imag
 """
 import asyncio
 import base64
+import hashlib
 import io
 import logging
-import json
-from typing import Optional, Dict, Any
-import aiohttp
+from collections import OrderedDict
+from typing import Awaitable, Callable, List, Optional, Dict, Any, Set, Tuple
 from google import genai
 from google.genai import types
 from PIL import Image
 from io import BytesIO
 
 from src.models.size_chart import GeminiSizeChartExtractionResult, SizeChart, SizeChartGemini
+from src.utils.http_client import HTTPClient
 
 logger = logging.getLogger(__name__)
 
 
+def _sniff_mime_type(data: bytes) -> Optional[str]:
+    """Return the MIME type for JPEG, PNG or WebP bytes, else None."""
+    if data.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg'
+    if data.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'image/png'
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'image/webp'
+    return None
+
+
+class GeminiBatcher:
+    """Coalesce concurrent chart extractions into multi-image Gemini calls.
+
+    Requests that arrive within ``max_wait`` seconds of each other, up to
+    ``max_batch`` of them, go out as one ``generate_content`` call. If a
+    batch call fails or returns the wrong number of results, each image in
+    it is retried on its own.
+    """
+
+    def __init__(
+        self,
+        extractor: "GeminiSizeChartExtractor",
+        max_batch: int = 8,
+        max_wait: float = 0.025
+    ):
+        self.extractor = extractor
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._pending: List[Tuple[bytes, str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, image_data: bytes, mime_type: str) -> Optional[GeminiSizeChartExtractionResult]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((image_data, mime_type, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[bytes, str, asyncio.Future]]):
+        images = [(data, mime_type) for data, mime_type, _ in batch]
+        try:
+            if len(batch) == 1:
+                results = [await self.extractor.generate_content(*images[0])]
+            else:
+                results = await self.extractor.generate_batch(images)
+                if len(results) != len(batch):
+                    raise ValueError(f"Expected {len(batch)} results, got {len(results)}")
+        except Exception as e:
+            if len(batch) == 1:
+                results = [e]
+            else:
+                logger.warning(f"Batched Gemini call failed, retrying images one by one: {e}")
+                results = await asyncio.gather(
+                    *[self.extractor.generate_content(*image) for image in images],
+                    return_exceptions=True
+                )
+
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
 class GeminiSizeChartExtractor:
     """Extract structured size chart data from images using Gemini 2.5 Flash."""
 
+    # Maximum number of extracted charts remembered per extractor
+    CACHE_SIZE = 1024
+
     # System prompt for size chart extraction
     SYSTEM_PROMPT = """You are an expert at extracting size chart data from images. Your task is to analyze the provided image and extract size chart information in a structured format.
 
@@ -40,18 +125,36 @@ Important:
 - Extract numeric ranges as they appear (e.g., "32-34" not just "33")
 """
 
-    def __init__(self, api_key: str, model_name: str = "gemini-2.0-flash-exp"):
+    def __init__(
+        self,
+        api_key: str,
+        http_client: HTTPClient,
+        model_name: str = "gemini-2.0-flash-exp",
+        concurrency: int = 8,
+        batch_size: int = 8
+    ):
         """
         Initialize the Gemini extractor.
 
         Args:
             api_key: Google AI API key
+            http_client: Shared client used to download chart images
             model_name: Gemini model to use (default: gemini-2.0-flash-exp)
+            concurrency: Maximum Gemini calls in flight at once (default: 8)
+            batch_size: Most images sent in one Gemini call; 1 disables batching (default: 8)
         """
         self.client = genai.Client(
             api_key=api_key,
         )
         self.model_name = model_name
+        self.http_client = http_client
+        # Gemini quota is separate from the store's HTTP rate limit
+        self._semaphore = asyncio.Semaphore(concurrency)
+        # Stores reuse one chart image across many products; extract each once.
+        # Keys are image URLs or content hashes, bounded LRU-style.
+        self._charts: OrderedDict[str, Optional[SizeChart]] = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._batcher = GeminiBatcher(self, max_batch=batch_size) if batch_size > 1 else None
 
     async def generate_content(self, image_data: bytes, mime_type: str) -> Optional[GeminiSizeChartExtractionResult]:
         generate_content_config = types.GenerateContentConfig(
@@ -64,53 +167,131 @@ Important:
             types.Part.from_text(
                 text="Analyze this image and extract the size chart data according to the JSON schema.")
         ]
-        response = await self.client.aio.models.generate_content(
-            model=self.model_name,
-            contents=contents,
-            config=generate_content_config
-        )
+        async with self._semaphore:
+            response = await self.client.aio.models.generate_content(
+                model=self.model_name,
+                contents=contents,
+                config=generate_content_config
+            )
         if response.parsed:
             return response.parsed
         return None
 
+    async def generate_batch(
+        self,
+        images: List[Tuple[bytes, str]]
+    ) -> List[Optional[GeminiSizeChartExtractionResult]]:
+        """Extract several images in one call, returning one result per image in order."""
+        generate_content_config = types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=list[GeminiSizeChartExtractionResult],
+            system_instruction=[types.Part.from_text(text=self.SYSTEM_PROMPT)]
+        )
+        contents = []
+        for i, (image_data, mime_type) in enumerate(images, 1):
+            contents.append(types.Part.from_text(text=f"Image {i}:"))
+            contents.append(types.Part.from_bytes(data=image_data, mime_type=mime_type))
+        contents.append(types.Part.from_text(
+            text=f"Analyze each of the {len(images)} images independently and return a JSON "
+                 f"array with exactly one result per image, in the same order as the images."))
+
+        async with self._semaphore:
+            response = await self.client.aio.models.generate_content(
+                model=self.model_name,
+                contents=contents,
+                config=generate_content_config
+            )
+        return list(response.parsed or [])
+
     async def extract_table(self, image_url: str) -> Optional[SizeChart]:
+        image_url = image_url.strip()
+        if image_url.startswith('//'):
+            image_url = f'https:{image_url}'
+
+        # Failures propagate through the caches uncached, so a later call retries
         try:
-            if image_url.startswith('//'):
-                image_url = f'https:{image_url}'
-            
             if image_url.startswith('data:image/'):
-                base64_data = image_url.split(',')[1]
-                image_bytes = base64.b64decode(base64_data)
-                image = Image.open(BytesIO(image_bytes))
+                # Data URIs are keyed by their decoded content instead
+                return await self._extract_table(image_url)
+            return await self._cached(image_url, lambda: self._extract_table(image_url))
+        except Exception as e:
+            logger.error(f"Failed to extract size chart from image: {e}")
+            return None
 
-            else:
+    async def _cached(
+        self,
+        key: str,
+        extract: Callable[[], Awaitable[Optional[SizeChart]]]
+    ) -> Optional[SizeChart]:
+        """Return the chart cached under ``key``, extracting it at most once.
+
+        Concurrent callers asking for the same key share one in-flight call,
+        which runs as its own task: cancelling whichever caller started it
+        does not cancel the others waiting on the same key.
+        """
+        if key in self._charts:
+            self._charts.move_to_end(key)
+            logger.debug(f"Reusing size chart for {key[:80]}")
+            return self._charts[key]
 
-                if not image_url.startswith(('http://', 'https://')):
-                    image_url = f'https://{image_url}'
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._extract_and_cache(key, extract))
+            # Waiters re-raise any failure; don't warn if there are none
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._in_flight[key] = task
+        return await asyncio.shield(task)
+
+    async def _extract_and_cache(
+        self,
+        key: str,
+        extract: Callable[[], Awaitable[Optional[SizeChart]]]
+    ) -> Optional[SizeChart]:
+        try:
+            size_chart = await extract()
+        finally:
+            del self._in_flight[key]
 
-                image_url = image_url.strip()
+        self._charts[key] = size_chart
+        if len(self._charts) > self.CACHE_SIZE:
+            self._charts.popitem(last=False)
+        return size_chart
 
-                async with aiohttp.ClientSession() as client:
-                    async with client.get(image_url) as response:
-                        if response.status != 200:
-                            logger.error(f"Failed to fetch image from {image_url}: {response.status}")
-                            return None
-                            
-                        image_bytes = await response.read()
-                        image = Image.open(io.BytesIO(image_bytes))
+    async def _extract_table(self, image_url: str) -> Optional[SizeChart]:
+        if image_url.startswith('data:image/'):
+            base64_data = image_url.split(',')[1]
+            image_bytes = base64.b64decode(base64_data)
+
+        else:
+
+            if not image_url.startswith(('http://', 'https://')):
+                image_url = f'https://{image_url}'
+
+            image_bytes = await self.http_client.get_bytes(image_url)
+
+        # Catches the same image served under different URLs or query strings
+        digest = hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+        return await self._cached(
+            f'blake2b:{digest}', lambda: self._extract_from_bytes(image_bytes))
+
+    async def _extract_from_bytes(self, image_bytes: bytes) -> Optional[SizeChart]:
+        mime_type = _sniff_mime_type(image_bytes)
+        if mime_type is None:
+            # Only re-encode formats Gemini cannot take as they are
+            image = Image.open(BytesIO(image_bytes))
             buffer = io.BytesIO()
-            image.save(buffer, format='JPEG')
-            image_bytes_for_api = buffer.getvalue()
-            result = await self.generate_content(image_bytes_for_api, 'image/jpeg')
-            if result and result.has_size_chart and result.size_chart:
-                converted_size_chart = self._convert_to_standard_format(result.size_chart)
-                return converted_size_chart
+            image.convert('RGB').save(buffer, format='JPEG')
+            image_bytes, mime_type = buffer.getvalue(), 'image/jpeg'
 
-            return None
+        if self._batcher:
+            result = await self._batcher.submit(image_bytes, mime_type)
+        else:
+            result = await self.generate_content(image_bytes, mime_type)
+        if result and result.has_size_chart and result.size_chart:
+            converted_size_chart = self._convert_to_standard_format(result.size_chart)
+            return converted_size_chart
 
-        except Exception as e:
-            logger.error(f"Failed to extract size chart from image: {e}")
-            return None
+        return None
 
     def _convert_to_standard_format(self, gemini_size_chart: SizeChartGemini) -> SizeChart:
 
@@ -123,5 +304,5 @@ Important:
                 row_dict[kv_pair.key] = kv_pair.value
             converted_rows.append(row_dict)
 
-        return SizeChart(headers=headers, rows=converted_rows)
+        return SizeChart.model_construct(headers=headers, rows=converted_rows)
 
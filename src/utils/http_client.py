@@ -1,71 +1,214 @@
 
 import asyncio
 import logging
-from typing import Optional, Dict, Any
+import random
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Dict, Any, Tuple
 import aiohttp
-from aiohttp import ClientSession, ClientTimeout
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
-    before_sleep_log
-)
+import orjson
+from aiohttp import ClientSession, ClientTimeout, StreamReader, TCPConnector
 from fake_useragent import UserAgent
 
+from .response_cache import ResponseCache
+
 logger = logging.getLogger(__name__)
 
+# Statuses worth retrying; any other 4xx fails immediately
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_BACKOFF = 10.0
+MAX_RETRY_AFTER = 60.0
+
+FALLBACK_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# fake_useragent parses its whole UA database on construction, so sample once
+try:
+    _UA_POOL = UserAgent()
+    _UA_CACHE = tuple(_UA_POOL.random for _ in range(50))
+except Exception as e:
+    logger.warning(f"Could not load user agents, using a fixed one: {e}")
+    _UA_CACHE = (FALLBACK_USER_AGENT,)
+
+
+def _retry_after(response: aiohttp.ClientResponse, attempt: int) -> float:
+    """Seconds to wait before retrying, from Retry-After when it is numeric."""
+    try:
+        return min(float(response.headers['Retry-After']), MAX_RETRY_AFTER)
+    except (KeyError, ValueError):
+        return min(2.0 ** attempt, MAX_BACKOFF)
+
 
 class HTTPClient:
 
     def __init__(
         self,
         timeout: int = 30,
-        max_retries: int = 3,
+        max_retries: int = 2,
         user_agent: Optional[str] = None,
-        headers: Optional[Dict[str, str]] = None
+        headers: Optional[Dict[str, str]] = None,
+        max_connections: int = 100,
+        per_host_limit: int = 16,
+        cache: Optional[ResponseCache] = None
     ):
         self.timeout = ClientTimeout(total=timeout)
         self.max_retries = max_retries
-        self.ua = UserAgent()
-        self.user_agent = user_agent or self.ua.random
+        self.user_agent = user_agent or random.choice(_UA_CACHE)
         self.headers = headers or {}
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
+        self.cache = cache
         self.session: Optional[ClientSession] = None
 
+    def _get_session(self) -> ClientSession:
+        """Return the shared session, creating it on first use."""
+        if self.session is None or self.session.closed:
+            connector = TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.per_host_limit,
+                use_dns_cache=True,
+                ttl_dns_cache=300,
+                keepalive_timeout=30,
+                enable_cleanup_closed=True
+            )
+            self.session = ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                headers={
+                    'User-Agent': self.user_agent,
+                    **self.headers
+                }
+            )
+        return self.session
+
+    async def aclose(self):
+        if self.session:
+            await self.session.close()
+            self.session = None
+
     async def __aenter__(self):
-        self.session = ClientSession(
-            timeout=self.timeout,
-            headers={
-                'User-Agent': self.user_agent,
-                **self.headers
-            }
-        )
+        self._get_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        await self.aclose()
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type(
-            (aiohttp.ClientError, asyncio.TimeoutError)),
-        before_sleep=before_sleep_log(logger, logging.WARNING)
-    )
     async def get(self, url: str, **kwargs) -> str:
+        body, charset = await self._fetch(url, **kwargs)
+        return body.decode(charset or 'utf-8', errors='replace')
 
-        if not self.session:
-            raise RuntimeError("HTTPClient must be used as a context manager")
-
-        async with self.session.get(url, **kwargs) as response:
-            response.raise_for_status()
-            return await response.text()
+    async def get_bytes(self, url: str, **kwargs) -> bytes:
+        body, _ = await self._fetch(url, **kwargs)
+        return body
 
     async def get_json(self, url: str, **kwargs) -> Dict[str, Any]:
-        if not self.session:
-            raise RuntimeError("HTTPClient must be used as a context manager")
+        body, _ = await self._fetch(url, **kwargs)
+        return orjson.loads(body)
+
+    async def head(self, url: str, **kwargs) -> int:
+        async with self._get_session().head(url, **kwargs) as response:
+            return response.status
+
+    async def _fetch(self, url: str, **kwargs) -> Tuple[bytes, Optional[str]]:
+        """Return the response body and charset, consulting the cache if set.
+
+        Connection errors and 429/5xx responses are retried up to
+        ``max_retries`` times with exponential backoff, or after the server's
+        ``Retry-After`` delay when it sends one.
+        """
+        # Requests with extra options may not be keyed by URL alone
+        cache = self.cache if not kwargs else None
+        cached = cache.get(url) if cache else None
+        if cached and cached.fresh:
+            return cached.body, cached.charset
+
+        if cached and cached.etag:
+            kwargs['headers'] = {'If-None-Match': cached.etag}
+
+        attempt = 0
+        while True:
+            last_attempt = attempt == self.max_retries
+            try:
+                async with self._get_session().get(url, **kwargs) as response:
+                    if cached and response.status == 304:
+                        cache.touch(url, response.headers.get('Cache-Control'))
+                        return cached.body, cached.charset
+
+                    if response.status in RETRY_STATUSES and not last_attempt:
+                        delay = _retry_after(response, attempt)
+                        logger.warning(
+                            f"HTTP {response.status} for {url}, retrying in {delay:.1f}s")
+                    else:
+                        response.raise_for_status()
+                        body = await response.read()
+                        if cache:
+                            cache.set(
+                                url,
+                                body,
+                                charset=response.charset,
+                                etag=response.headers.get('ETag'),
+                                cache_control=response.headers.get('Cache-Control')
+                            )
+                        return body, response.charset
+
+            except aiohttp.ClientResponseError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if last_attempt:
+                    raise
+                delay = min(2.0 ** attempt, MAX_BACKOFF)
+                logger.warning(f"Request to {url} failed ({e!r}), retrying in {delay:.1f}s")
+
+            # Sleep after the response is released so the connection is reused
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _open(self, url: str, **kwargs) -> aiohttp.ClientResponse:
+        """Send a GET and return the response with its body still unread.
+
+        Opening the request is retried like ``_fetch``; the caller must
+        release the response.
+        """
+        attempt = 0
+        while True:
+            last_attempt = attempt == self.max_retries
+            try:
+                response = await self._get_session().get(url, **kwargs)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if last_attempt:
+                    raise
+                delay = min(2.0 ** attempt, MAX_BACKOFF)
+                logger.warning(f"Request to {url} failed ({e!r}), retrying in {delay:.1f}s")
+            else:
+                if response.status in RETRY_STATUSES and not last_attempt:
+                    delay = _retry_after(response, attempt)
+                    logger.warning(
+                        f"HTTP {response.status} for {url}, retrying in {delay:.1f}s")
+                    response.release()
+                else:
+                    try:
+                        response.raise_for_status()
+                    except aiohttp.ClientResponseError:
+                        response.release()
+                        raise
+                    return response
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @asynccontextmanager
+    async def stream(self, url: str, **kwargs) -> AsyncIterator[StreamReader]:
+        """Yield the response body as a stream instead of reading it whole.
 
-        async with self.session.get(url, **kwargs) as response:
-            response.raise_for_status()
-            return await response.json()
+        The yielded reader supports ``await read(n)`` and ``iter_chunked(n)``,
+        so it can be handed straight to incremental parsers such as ijson.
+        Opening the stream is retried like ``get``; once the body has started
+        arriving a failure propagates, since the consumer has already seen
+        part of it.
+        """
+        response = await self._open(url, **kwargs)
+        try:
+            yield response.content
+        finally:
+            response.release()
@@ -1,23 +1,117 @@
 import re
 import logging
-from typing import List, Dict, Optional, Any, Tuple
+from typing import FrozenSet, Iterator, List, Dict, Optional, Any, Tuple, Union
 from bs4 import BeautifulSoup, Tag
+from lxml import etree
 
 logger = logging.getLogger(__name__)
 
+# Comments and blank text never hold size data; dropping them keeps trees small
+HTML_PARSER = etree.HTMLParser(
+    encoding='utf-8',
+    remove_blank_text=True,
+    remove_comments=True,
+    collect_ids=False,
+    huge_tree=True
+)
+
+# \s already covers non-breaking spaces; zero-width spaces are folded into the same run
+_WS_RE = re.compile(r'[\s\u200b]+')
+
+_PARENT_KEYWORDS = frozenset({'size', 'sizes', 'chart', 'charts', 'sizing', 'sizechart', 'sizeguide'})
+# Run-together names ("productsizeguide", "sizingtable") match these within a word;
+# bare "size" must be a whole word so "oversized" does not qualify
+_PARENT_COMPOUNDS = ('sizechart', 'sizeguide', 'sizing')
+# Splits class/id names into words: "size-chart", "size_guide" and "KiwiSizingChart" all qualify
+_ATTR_TOKEN_RE = re.compile(r'[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+')
+
+_DEFAULT_SPAN = etree.XPath(
+    './/span[contains(concat(" ", normalize-space(@class), " "), " default ")]'
+)
+
+
+def _lxml_text(element: etree._Element) -> str:
+    return ''.join(element.itertext())
+
+
+def _lxml_attr_tokens(element: etree._Element) -> FrozenSet[str]:
+    """Lowercased words of an element's class and id."""
+    attrs = (element.get('class') or '') + ' ' + (element.get('id') or '')
+    return frozenset(token.lower() for token in _ATTR_TOKEN_RE.findall(attrs))
+
+
+def _is_size_hint(tokens: FrozenSet[str]) -> bool:
+    """Whether class/id words mark a size chart container."""
+    if tokens & _PARENT_KEYWORDS:
+        return True
+    return any(compound in token for token in tokens for compound in _PARENT_COMPOUNDS)
+
+
+def _lxml_ancestor_tokens(table: etree._Element) -> Iterator[FrozenSet[str]]:
+    parent = table.getparent()
+    while parent is not None and parent.tag != 'body':
+        yield _lxml_attr_tokens(parent)
+        parent = parent.getparent()
+
 
 class SizeChartParser:
 
+    SIZE_KEYWORDS = frozenset([
+        'size', 'chart', 'measurement', 'dimension', 'sizing',
+        'fit', 'length', 'width', 'chest', 'waist', 'hip',
+        'shoulder', 'sleeve', 'bust', 'inseam', 'size guide'
+    ])
+
+    # One alternation scans the text once instead of once per keyword
+    SIZE_KEYWORD_RE = re.compile(
+        r'\b(' + '|'.join(map(re.escape, sorted(SIZE_KEYWORDS, key=len, reverse=True))) + r')\b'
+    )
+
+    SIZE_PATTERNS = [
+        re.compile(r'\b(xs|s|m|l|xl|xxl|xxxl|small|medium|large)\b', re.I),
+        re.compile(r'\b\d{2,3}\s*(cm|inch|in|")\b', re.I),
+        re.compile(r'\b(chest|waist|hip|bust)\s*[:=]?\s*\d+', re.I)
+    ]
+
     @staticmethod
     def clean_text(text: str) -> str:
         if not text:
             return ""
-        text = re.sub(r'\s+', ' ', text.strip())
-        text = re.sub(r'[\u200b\u00a0]', ' ', text)
-        return text.strip()
+        return _WS_RE.sub(' ', text).strip()
+
+    @staticmethod
+    def parse_html(html: str) -> Optional[etree._Element]:
+        """Parse HTML into an lxml tree with HTML_PARSER, or None if empty."""
+        if not html or not html.strip():
+            return None
+        try:
+            return etree.fromstring(html.encode('utf-8', 'replace'), HTML_PARSER)
+        except (etree.ParserError, etree.XMLSyntaxError) as e:
+            logger.debug(f"Failed to parse HTML: {e}")
+            return None
 
     @staticmethod
-    def extract_table_data(table: Tag) -> Tuple[List[str], List[Dict[str, str]]]:
+    def _cell_value(cell: Tag, measurement: bool) -> str:
+        """Cell text, preferring a ``span.default`` value; measurements get a CM unit."""
+        default_span = cell.find('span', class_='default')
+        if not default_span:
+            return SizeChartParser.clean_text(cell.get_text())
+        value = SizeChartParser.clean_text(default_span.get_text())
+        return f"{value} CM" if measurement else value
+
+    @staticmethod
+    def _cell_value_lxml(cell: etree._Element, measurement: bool) -> str:
+        default_span = _DEFAULT_SPAN(cell)
+        if not default_span:
+            return SizeChartParser.clean_text(_lxml_text(cell))
+        value = SizeChartParser.clean_text(_lxml_text(default_span[0]))
+        return f"{value} CM" if measurement else value
+
+    @staticmethod
+    def extract_table_data(table: Union[Tag, etree._Element]) -> Tuple[List[str], List[Dict[str, str]]]:
+        if isinstance(table, etree._Element):
+            return SizeChartParser.extract_table_data_lxml(table)
+
         headers = []
         rows = []
 
@@ -51,24 +145,57 @@ class SizeChartParser:
                     continue
 
 
-            row_data = {}
-            for i, cell in enumerate(cells):
-                if i >= len(headers):
-                    continue
+            # zip stops at the shorter side, dropping cells beyond the headers
+            row_data = {
+                header: SizeChartParser._cell_value(cell, header != headers[0])
+                for header, cell in zip(headers, cells)
+            }
 
-                header = headers[i]
+            if row_data:
+                rows.append(row_data)
 
+        return headers, rows
 
-                default_span = cell.find('span', class_='default')
-                if default_span:
+    @staticmethod
+    def extract_table_data_lxml(table: etree._Element) -> Tuple[List[str], List[Dict[str, str]]]:
+        headers = []
+        rows = []
 
-                    value = SizeChartParser.clean_text(default_span.get_text())
-                    if header != headers[0]:  # If not the size column
-                        value = f"{value} CM"
-                else:
-                    value = SizeChartParser.clean_text(cell.get_text())
+        thead = table.find('.//thead')
+        if thead is not None:
+            header_row = thead.find('.//tr')
+            if header_row is not None:
+                headers = [
+                    SizeChartParser.clean_text(_lxml_text(th))
+                    for th in header_row.iter('th', 'td')
+                ]
 
-                row_data[header] = value
+        if not headers:
+            first_row = table.find('.//tr')
+            if first_row is not None:
+                cells = list(first_row.iter('th', 'td'))
+                if cells and (cells[0].tag == 'th' or all('header' in (cell.get('class') or '') for cell in cells)):
+                    headers = [SizeChartParser.clean_text(
+                        _lxml_text(cell)) for cell in cells]
+
+        tbody = table.find('.//tbody')
+        if tbody is None:
+            tbody = table
+        for row in tbody.iter('tr'):
+            cells = list(row.iter('td', 'th'))
+            if not cells:
+                continue
+
+            if headers and len(cells) == len(headers):
+                cell_texts = [SizeChartParser.clean_text(
+                    _lxml_text(cell)) for cell in cells]
+                if cell_texts == headers:
+                    continue
+
+            row_data = {
+                header: SizeChartParser._cell_value_lxml(cell, header != headers[0])
+                for header, cell in zip(headers, cells)
+            }
 
             if row_data:
                 rows.append(row_data)
@@ -76,56 +203,68 @@ class SizeChartParser:
         return headers, rows
 
     @staticmethod
-    def find_size_charts(soup: BeautifulSoup) -> List[Tuple[Tag, float]]:
-
-        size_keywords = [
-            'size', 'chart', 'measurement', 'dimension', 'sizing',
-            'fit', 'length', 'width', 'chest', 'waist', 'hip',
-            'shoulder', 'sleeve', 'bust', 'inseam', 'size guide'
-        ]
-
-        size_patterns = [
-            re.compile(r'\b(xs|s|m|l|xl|xxl|xxxl|small|medium|large)\b', re.I),
-            re.compile(r'\b\d{2,3}\s*(cm|inch|in|")\b', re.I),
-            re.compile(r'\b(chest|waist|hip|bust)\s*[:=]?\s*\d+', re.I)
-        ]
-
-        potential_tables = []
-
-        for table in soup.find_all('table'):
-            confidence = 0.0
-
-            table_text = table.get_text().lower()
-            for keyword in size_keywords:
-                if keyword in table_text:
-                    confidence += 0.1
-
-            for pattern in size_patterns:
-                matches = pattern.findall(table_text)
-                if matches:
-                    confidence += 0.2 * min(len(matches) / 5, 1.0)
-
-            headers, rows = SizeChartParser.extract_table_data(table)
-            if headers and rows:
-                header_text = ' '.join(headers).lower()
-                for keyword in size_keywords:
-                    if keyword in header_text:
-                        confidence += 0.2
-
-                if 2 <= len(rows) <= 20:
-                    confidence += 0.1
-
-            parent = table.parent
-            while parent and parent.name != 'body':
-                parent_text = ' '.join(parent.get('class', [])) + ' ' + parent.get('id', '')
-                if any(keyword in parent_text.lower() for keyword in ['size', 'chart', 'sizing']):
-                    confidence += 0.3
-                    break
-                parent = parent.parent
+    def _score_table(headers: List[str], rows: List[Dict[str, str]], ancestor_tokens: List[FrozenSet[str]]) -> float:
+        confidence = 0.0
+
+        # Score the extracted cells rather than walking the table's text again
+        header_text = ' '.join(headers).lower()
+        table_text = ' '.join([header_text, *(v for row in rows for v in row.values())]).lower()
+        hits = len(SizeChartParser.SIZE_KEYWORD_RE.findall(table_text))
+        confidence += 0.1 * min(hits, 5)
+
+        for pattern in SizeChartParser.SIZE_PATTERNS:
+            matches = pattern.findall(table_text)
+            if matches:
+                confidence += 0.2 * min(len(matches) / 5, 1.0)
+
+        confidence += 0.2 * len(set(SizeChartParser.SIZE_KEYWORD_RE.findall(header_text)))
 
+        if 2 <= len(rows) <= 20:
+            confidence += 0.1
+
+        if any(_is_size_hint(tokens) for tokens in ancestor_tokens):
+            confidence += 0.3
+
+        return confidence
+
+    @staticmethod
+    def iter_size_charts(soup: Union[BeautifulSoup, etree._Element]) -> Iterator[Tuple[etree._Element, float]]:
+        """Lazily yield (table, confidence) for tables that look like size charts.
+
+        Tables whose own or ancestor class/id mention sizing are scored first,
+        so callers that stop at the first usable chart rarely score the rest.
+        Each table's cells are extracted once and scored from that; tables
+        without data rows are skipped.
+        Discovery runs on lxml; a BeautifulSoup document is accepted for
+        compatibility but re-parsed, and the yielded tables are lxml elements.
+        """
+        if not isinstance(soup, etree._Element):
+            # BeautifulSoup callers are re-parsed once; tables come back as lxml elements
+            soup = SizeChartParser.parse_html(str(soup))
+            if soup is None:
+                return
+
+        hinted, others = [], []
+        for table in soup.iter('table'):
+            ancestor_tokens = list(_lxml_ancestor_tokens(table))
+            hint = any(
+                _is_size_hint(tokens)
+                for tokens in [_lxml_attr_tokens(table), *ancestor_tokens]
+            )
+            (hinted if hint else others).append((table, ancestor_tokens))
+
+        for table, ancestor_tokens in hinted + others:
+            headers, rows = SizeChartParser.extract_table_data_lxml(table)
+            # Callers can only use tables that yield rows, so skip the scoring
+            if not rows:
+                continue
+            confidence = SizeChartParser._score_table(headers, rows, ancestor_tokens)
             if confidence > 0.3:
-                potential_tables.append((table, confidence))
+                yield table, confidence
 
+    @staticmethod
+    def find_size_charts(soup: Union[BeautifulSoup, etree._Element]) -> List[Tuple[etree._Element, float]]:
+        potential_tables = list(SizeChartParser.iter_size_charts(soup))
         potential_tables.sort(key=lambda x: x[1], reverse=True)
 
         return potential_tables
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+class PlaywrightClient:
+    """Rendered-HTML client on Playwright's native async API.
+
+    Drop-in alternative to ``SeleniumClient``: one Chromium process is
+    launched on first use, and ``pool_size`` browser contexts are shared
+    between concurrent callers, each page opening in a fresh tab. Requires
+    the optional ``playwright`` dependency and ``playwright install chromium``.
+    """
+
+    def __init__(
+        self,
+        headless: bool = True,
+        timeout: int = 30,
+        page_load_timeout: int = 30,
+        wait_for_element: Optional[str] = None,
+        pool_size: int = 1
+    ):
+        self.headless = headless
+        self.timeout = timeout
+        self.page_load_timeout = page_load_timeout
+        self.wait_for_element = wait_for_element
+        self.pool_size = max(pool_size, 1)
+        self._playwright: Any = None
+        self._browser: Any = None
+        self._contexts: Optional[asyncio.Queue] = None
+        self._start_lock = asyncio.Lock()
+
+    async def _start(self) -> asyncio.Queue:
+        async with self._start_lock:
+            if self._contexts is None:
+                from playwright.async_api import async_playwright
+
+                self._playwright = await async_playwright().start()
+                try:
+                    self._browser = await self._playwright.chromium.launch(headless=self.headless)
+                    contexts: asyncio.Queue = asyncio.Queue()
+                    for _ in range(self.pool_size):
+                        contexts.put_nowait(await self._browser.new_context(
+                            user_agent=USER_AGENT,
+                            viewport={'width': 1920, 'height': 1080}
+                        ))
+                except BaseException:
+                    # Don't leave the browser or the Playwright driver running
+                    await self._shutdown()
+                    raise
+                self._contexts = contexts
+        return self._contexts
+
+    async def _shutdown(self):
+        try:
+            if self._browser:
+                await self._browser.close()
+            if self._playwright:
+                await self._playwright.stop()
+        except Exception as e:
+            logger.warning(f"Error closing browser: {e}")
+        finally:
+            self._browser = None
+            self._playwright = None
+            self._contexts = None
+
+    async def close(self):
+        """Close the browser and stop Playwright."""
+        async with self._start_lock:
+            await self._shutdown()
+
+    async def __aenter__(self):
+        await self._start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def get_rendered_html(self, url: str) -> str:
+        """
+        Get fully rendered HTML after JavaScript execution.
+
+        Args:
+            url: URL to load
+
+        Returns:
+            Rendered HTML content
+        """
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+        contexts = await self._start()
+        context = await contexts.get()
+        page = None
+        try:
+            page = await context.new_page()
+            # Bounds every page call without an explicit timeout, e.g. content()
+            page.set_default_timeout(self.timeout * 1000)
+            try:
+                await page.goto(
+                    url,
+                    wait_until='domcontentloaded',
+                    timeout=self.page_load_timeout * 1000
+                )
+                if self.wait_for_element:
+                    await page.wait_for_selector(self.wait_for_element, timeout=10000)
+                else:
+                    await page.wait_for_load_state('networkidle', timeout=5000)
+            except PlaywrightTimeoutError as e:
+                logger.warning(f"Timeout loading {url}: {e}")
+
+            return await page.content()
+        finally:
+            try:
+                if page is not None:
+                    await page.close()
+            except Exception as e:
+                logger.warning(f"Error closing page: {e}")
+            finally:
+                # Always hand the context back, or the pool shrinks for good
+                contexts.put_nowait(context)
@@ -1,15 +1,39 @@
-from asyncio_throttle.throttler import Throttler
+import asyncio
 
 
 class RateLimiter:
-    """Rate limiter for controlling request frequency."""
+    """Token-bucket rate limiter for controlling request frequency.
 
-    def __init__(self, rate_limit: float = 1.0):
-        self.rate_limit = rate_limit
-        self.throttler = Throttler(rate_limit=int(1/rate_limit) if rate_limit > 0 else float('inf'))  # type: ignore
+    Tokens refill at ``requests_per_second`` up to ``burst``, and each request
+    spends one. A request that finds the bucket empty reserves the next token
+    and sleeps until it is due, so concurrent callers are spaced out evenly
+    instead of waking together. ``requests_per_second <= 0`` disables
+    limiting.
+    """
+
+    def __init__(self, requests_per_second: float = 1.0, burst: int = 1):
+        self.requests_per_second = max(requests_per_second, 0.0)
+        self._capacity = float(max(burst, 1))
+        self._tokens = self._capacity
+        self._updated_at: float = 0.0
 
     async def acquire(self):
-        await self.throttler.acquire()
+        rate = self.requests_per_second
+        if not rate:
+            return
+
+        # No await between reading and spending, so this is atomic on the loop
+        now = asyncio.get_running_loop().time()
+        if self._updated_at:
+            self._tokens = min(
+                self._capacity,
+                self._tokens + (now - self._updated_at) * rate
+            )
+        self._updated_at = now
+        self._tokens -= 1
+
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / rate)
 
     async def __aenter__(self):
         await self.acquire()
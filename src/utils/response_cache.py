@@ -0,0 +1,91 @@
+"""
+On-disk cache of HTTP response bodies so reruns skip the network.
+"""
+import hashlib
+import logging
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    charset: Optional[str]
+    etag: Optional[str]
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+class ResponseCache:
+    """SQLite-backed response cache keyed by the SHA-1 of the request URL.
+
+    Entries expire after ``Cache-Control: max-age`` when the server sends it,
+    otherwise after ``expire_after`` seconds. Stale entries keep their ETag so
+    the client can revalidate them instead of downloading the body again.
+    """
+
+    def __init__(self, path: str = '.http_cache.sqlite', expire_after: int = 3600):
+        self.path = path
+        self.expire_after = expire_after
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, url TEXT, body BLOB, charset TEXT, '
+            'etag TEXT, expires_at REAL)'
+        )
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        row = self._conn.execute(
+            'SELECT body, charset, etag, expires_at FROM responses WHERE key = ?',
+            (self._key(url),)
+        ).fetchone()
+        if row is None:
+            return None
+        return CachedResponse(*row)
+
+    def set(
+        self,
+        url: str,
+        body: bytes,
+        charset: Optional[str] = None,
+        etag: Optional[str] = None,
+        cache_control: Optional[str] = None
+    ):
+        cache_control = (cache_control or '').lower()
+        if 'no-store' in cache_control:
+            return
+
+        match = _MAX_AGE_RE.search(cache_control)
+        ttl = int(match.group(1)) if match else self.expire_after
+        self._conn.execute(
+            'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+            (self._key(url), url, body, charset, etag, time.time() + ttl)
+        )
+        self._conn.commit()
+
+    def touch(self, url: str, cache_control: Optional[str] = None):
+        """Extend an entry's lifetime after a 304 Not Modified."""
+        match = _MAX_AGE_RE.search((cache_control or '').lower())
+        ttl = int(match.group(1)) if match else self.expire_after
+        self._conn.execute(
+            'UPDATE responses SET expires_at = ? WHERE key = ?',
+            (time.time() + ttl, self._key(url))
+        )
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
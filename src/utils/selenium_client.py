@@ -1,7 +1,7 @@
 import asyncio
 import logging
-import time
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, TypeVar
 from contextlib import asynccontextmanager
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -12,6 +12,90 @@ from selenium.common.exceptions import TimeoutException, WebDriverException
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
+# Resources never needed to read a size chart; blocked before they download
+BLOCKED_URL_PATTERNS = [
+    '*.jpg', '*.jpeg', '*.png', '*.webp', '*.gif', '*.svg',
+    '*.woff', '*.woff2', '*.ttf', '*.mp4', '*.webm',
+    '*google-analytics*', '*googletagmanager*', '*doubleclick*',
+    '*facebook.net*', '*hotjar*', '*clarity.ms*',
+]
+
+
+class SeleniumDriverPool:
+    """A fixed number of Chrome drivers reused across page loads.
+
+    Drivers are created lazily, and only when no idle driver is available,
+    so a run that never needs more than one page at a time only ever starts
+    one browser. A semaphore caps the number of drivers in use at ``size``.
+
+    Every driver gets its own single-thread executor, so all WebDriver
+    commands for it run on one thread and never compete with other blocking
+    work for the loop's default pool.
+    """
+
+    def __init__(self, create_driver: Callable[[], webdriver.Chrome], size: int = 1):
+        self._create_driver = create_driver
+        self.size = max(size, 1)
+        self._slots = asyncio.Semaphore(self.size)
+        self._idle: List[webdriver.Chrome] = []
+        self._executors: Dict[webdriver.Chrome, ThreadPoolExecutor] = {}
+
+    async def run(self, driver: webdriver.Chrome, func: Callable[[], T]) -> T:
+        """Run a blocking call on the driver's dedicated thread."""
+        return await asyncio.get_event_loop().run_in_executor(self._executors[driver], func)
+
+    async def acquire(self) -> webdriver.Chrome:
+        await self._slots.acquire()
+        if self._idle:
+            return self._idle.pop()
+
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='selenium')
+        try:
+            driver = await asyncio.get_event_loop().run_in_executor(executor, self._create_driver)
+        except BaseException:
+            executor.shutdown(wait=False)
+            self._slots.release()
+            raise
+        self._executors[driver] = executor
+        return driver
+
+    async def release(self, driver: webdriver.Chrome):
+        """Return a driver to the pool, replacing it if it no longer responds."""
+        if driver not in self._executors:
+            # Already quit by close() while it was borrowed
+            return
+
+        def reset() -> bool:
+            try:
+                driver.delete_all_cookies()
+                driver.current_url
+                return True
+            except Exception:
+                return False
+
+        if await self.run(driver, reset):
+            self._idle.append(driver)
+        else:
+            logger.warning("Recycling unresponsive Chrome driver")
+            await self._quit(driver)
+        self._slots.release()
+
+    async def _quit(self, driver: webdriver.Chrome):
+        try:
+            await self.run(driver, driver.quit)
+        except Exception as e:
+            logger.warning(f"Error closing driver: {e}")
+        finally:
+            self._executors.pop(driver).shutdown(wait=False)
+
+    async def close(self):
+        """Quit every driver the pool has started."""
+        await asyncio.gather(*[self._quit(driver) for driver in list(self._executors)])
+        self._idle = []
+        self._slots = asyncio.Semaphore(self.size)
+
 
 class SeleniumClient:
     """Simple, production-ready Selenium client for getting rendered HTML."""
@@ -21,13 +105,15 @@ class SeleniumClient:
         headless: bool = True,
         timeout: int = 30,
         page_load_timeout: int = 30,
-        wait_for_element: Optional[str] = None
+        wait_for_element: Optional[str] = None,
+        pool_size: int = 1
     ):
         self.headless = headless
         self.timeout = timeout
         self.page_load_timeout = page_load_timeout
         self.wait_for_element = wait_for_element
-        self._driver: Optional[webdriver.Chrome] = None
+        # Each driver renders one page at a time, so the pool bounds concurrency
+        self._pool = SeleniumDriverPool(self._create_driver, pool_size)
 
     def _create_driver(self) -> webdriver.Chrome:
         """Create and configure Chrome driver."""
@@ -42,7 +128,9 @@ class SeleniumClient:
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--disable-extensions")
         chrome_options.add_argument("--disable-plugins")
-        chrome_options.add_argument("--disable-images")
+        chrome_options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
         chrome_options.add_argument("--window-size=1920,1080")
 
         # Realistic user agent
@@ -53,36 +141,26 @@ class SeleniumClient:
         try:
             driver = webdriver.Chrome(options=chrome_options)
             driver.set_page_load_timeout(self.page_load_timeout)
-            driver.implicitly_wait(5)
+            # Image <src> attributes stay in the DOM; only the downloads are skipped
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
             return driver
         except Exception as e:
             logger.error(f"Failed to create Chrome driver: {e}")
             raise
 
-    async def get_driver(self) -> webdriver.Chrome:
-        """Get or create driver instance."""
-        if self._driver is None:
-            loop = asyncio.get_event_loop()
-            self._driver = await loop.run_in_executor(None, self._create_driver)
-        return self._driver
-
     async def close(self):
-        """Close the driver."""
-        if self._driver:
-            try:
-                await asyncio.get_event_loop().run_in_executor(None, self._driver.quit)
-            except Exception as e:
-                logger.warning(f"Error closing driver: {e}")
-            finally:
-                self._driver = None
+        """Close all pooled drivers."""
+        await self._pool.close()
 
     @asynccontextmanager
     async def session(self):
-        """Context manager for driver session."""
+        """Context manager that borrows a driver from the pool."""
+        driver = await self._pool.acquire()
         try:
-            yield await self.get_driver()
+            yield driver
         finally:
-            await self.close()
+            await self._pool.release(driver)
 
     async def get_rendered_html(self, url: str) -> str:
         """
@@ -94,20 +172,15 @@ class SeleniumClient:
         Returns:
             Rendered HTML content
         """
-        driver = await self.get_driver()
-        loop = asyncio.get_event_loop()
+        async with self.session() as driver:
+            return await self._render(driver, url)
 
+    async def _render(self, driver: webdriver.Chrome, url: str) -> str:
         def _get_rendered_page():
             try:
                 # Load the page
                 driver.get(url)
 
-                # Wait for body to be present
-                WebDriverWait(driver, self.timeout).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "body"))
-                )
-
-                # Wait for specific element if provided
                 if self.wait_for_element:
                     try:
                         WebDriverWait(driver, 10).until(
@@ -117,9 +190,10 @@ class SeleniumClient:
                     except TimeoutException:
                         logger.debug(
                             f"Element {self.wait_for_element} not found, proceeding anyway")
-
-                # Small delay to ensure all JS has executed
-                time.sleep(2)
+                else:
+                    WebDriverWait(driver, self.timeout).until(
+                        lambda d: d.execute_script('return document.readyState') == 'complete'
+                    )
 
                 return driver.page_source
 
@@ -130,4 +204,4 @@ class SeleniumClient:
                 logger.error(f"WebDriver error loading {url}: {e}")
                 raise
 
-        return await loop.run_in_executor(None, _get_rendered_page)
+        return await self._pool.run(driver, _get_rendered_page)
@@ -1,11 +1,61 @@
+import asyncio
+import io
+import json
 import pytest
+from contextlib import asynccontextmanager
 from unittest.mock import Mock, AsyncMock, patch
+from src.extractors.factory import ExtractorFactory
+from src.extractors.freakins import FreakinsExtractor
+from src.extractors.littleboxindia import LittleBoxIndiaExtractor
+from src.extractors.suqah import SuqahExtractor
 from src.extractors.westside import WestsideExtractor
 from src.utils.http_client import HTTPClient
 from src.utils.rate_limiter import RateLimiter
 from src.models.size_chart import Product, SizeChart
 
 
+class FakeStream:
+    """Minimal async reader standing in for an aiohttp response body."""
+
+    def __init__(self, payload):
+        self._buffer = io.BytesIO(json.dumps(payload).encode('utf-8'))
+
+    async def read(self, n=-1):
+        return self._buffer.read(n)
+
+
+def json_stream(payload):
+    """Build a side effect for HTTPClient.stream that serves ``payload``."""
+    @asynccontextmanager
+    async def stream(url, **kwargs):
+        yield FakeStream(payload)
+    return stream
+
+
+class FakeChunkedStream:
+    """Async reader that hands out a byte payload in small chunks."""
+
+    def __init__(self, payload: bytes, chunk_size: int = 16):
+        self._payload = payload
+        self._chunk_size = chunk_size
+
+    async def iter_chunked(self, n):
+        for i in range(0, len(self._payload), self._chunk_size):
+            yield self._payload[i:i + self._chunk_size]
+
+
+def sitemap_stream(documents):
+    """Build a side effect for HTTPClient.stream serving XML by URL path."""
+    @asynccontextmanager
+    async def stream(url, **kwargs):
+        path = url.split('://', 1)[-1].split('/', 1)[-1]
+        yield FakeChunkedStream(documents['/' + path].encode('utf-8'))
+    return stream
+
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
 class TestGenericShopifyExtractor:
     """Test cases for GenericShopifyExtractor."""
 
@@ -15,6 +65,7 @@ class TestGenericShopifyExtractor:
         client = Mock(spec=HTTPClient)
         client.get = AsyncMock()
         client.get_json = AsyncMock()
+        client.stream = Mock()
         return client
 
     @pytest.fixture
@@ -39,13 +90,13 @@ class TestGenericShopifyExtractor:
     async def test_get_product_urls_via_json(self, extractor):
         """Test getting product URLs via products.json."""
         # Mock products.json response
-        extractor.http_client.get_json.return_value = {
+        extractor.http_client.stream.side_effect = json_stream({
             'products': [
                 {'handle': 'product-1'},
                 {'handle': 'product-2'},
                 {'handle': 'product-3'}
             ]
-        }
+        })
 
         urls = await extractor.get_product_urls()
 
@@ -54,6 +105,22 @@ class TestGenericShopifyExtractor:
         assert 'https://test.com/products/product-2' in urls
         assert 'https://test.com/products/product-3' in urls
 
+    @pytest.mark.asyncio
+    async def test_extract_title_uses_products_json(self, extractor):
+        """Test titles from products.json are reused without another request."""
+        extractor.http_client.stream.side_effect = json_stream({
+            'products': [
+                {'handle': 'product-1', 'title': 'Product 1'}
+            ]
+        })
+
+        urls = await extractor.get_product_urls()
+
+        title = await extractor.extract_title(urls[0])
+
+        assert title == 'Product 1'
+        extractor.http_client.get_json.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_extract_size_chart_from_html(self, extractor):
         """Test extracting size chart from HTML."""
@@ -123,3 +190,145 @@ class TestGenericShopifyExtractor:
                 # Only one product had a size chart
                 assert len(result.products) == 1
                 assert result.products[0].product_title == "Product 1"
+
+    @pytest.mark.asyncio
+    async def test_extract_all_bounds_concurrency_and_keeps_order(
+        self, mock_http_client, mock_rate_limiter
+    ):
+        """Test products run concurrent_requests at a time but keep URL order."""
+        extractor = WestsideExtractor(
+            store_url="test.com",
+            http_client=mock_http_client,
+            rate_limiter=mock_rate_limiter,
+            max_products=10,
+            concurrent_requests=2
+        )
+        urls = [f'https://test.com/products/product-{i}' for i in range(6)]
+        in_flight = 0
+        peak = 0
+
+        async def extract_size_chart(url):
+            nonlocal in_flight, peak
+            i = int(url.rsplit('-', 1)[1])
+            in_flight += 1
+            peak = max(peak, in_flight)
+            # product-1 fails last, after every later URL has finished
+            await asyncio.sleep(0.05 if i == 1 else 0.001)
+            in_flight -= 1
+            if i % 3 == 1:
+                raise ValueError(f'bad {i}')
+            return Product(
+                product_title=f'Product {i}',
+                product_url=url,
+                size_chart=SizeChart(headers=['Size'], rows=[{'Size': 'S'}]) if i != 3 else None
+            )
+
+        with patch.object(extractor, 'get_product_urls', new_callable=AsyncMock, return_value=urls), \
+                patch.object(extractor, 'extract_size_chart', side_effect=extract_size_chart):
+            result = await extractor.extract_all()
+
+        assert peak == 2
+        assert [p.product_title for p in result.products] == ['Product 0', 'Product 2', 'Product 5']
+        assert result.errors == [
+            f'Error extracting {urls[1]}: bad 1',
+            f'Error extracting {urls[4]}: bad 4'
+        ]
+
+    @pytest.mark.asyncio
+    async def test_get_products_from_sitemap(self, extractor, mock_http_client):
+        """Test product URLs are collected from the child sitemaps of an index."""
+        mock_http_client.stream.side_effect = sitemap_stream({
+            '/sitemap.xml': (
+                f'<sitemapindex xmlns="{SITEMAP_NS}">'
+                '<sitemap><loc>https://test.com/sitemap_products_1.xml?from=1&amp;to=9</loc></sitemap>'
+                '<sitemap><loc>https://test.com/sitemap_pages_1.xml</loc></sitemap>'
+                '<sitemap><loc>https://test.com/feed.atom</loc></sitemap>'
+                '</sitemapindex>'
+            ),
+            '/sitemap_products_1.xml?from=1&to=9': (
+                f'<urlset xmlns="{SITEMAP_NS}">'
+                '<url><loc>https://test.com/</loc></url>'
+                '<url><loc> https://test.com/products/product-1 </loc></url>'
+                '<url><loc>https://test.com/products/product-2</loc></url>'
+                '<url><loc>https://test.com/products/product-1</loc></url>'
+                '</urlset>'
+            ),
+            '/sitemap_pages_1.xml': (
+                f'<urlset xmlns="{SITEMAP_NS}">'
+                '<url><loc>https://test.com/pages/about</loc></url>'
+                '</urlset>'
+            ),
+        })
+
+        urls = await extractor._get_products_from_sitemap()
+
+        assert urls == [
+            'https://test.com/products/product-1',
+            'https://test.com/products/product-2'
+        ]
+        streamed = [call.args[0] for call in mock_http_client.stream.call_args_list]
+        assert len(streamed) == 3
+        assert not any(url.endswith('feed.atom') for url in streamed)
+
+
+class TestExtractorFactory:
+    """Test cases for ExtractorFactory."""
+
+    @pytest.mark.parametrize('store_url', [
+        'westside.com',
+        'www.westside.com',
+        'https://westside.com/',
+        'http://www.westside.com',
+        'HTTPS://WWW.Westside.com/',
+    ])
+    def test_normalize_domain(self, store_url):
+        """Test scheme, case and trailing slashes are dropped and www. added."""
+        assert ExtractorFactory.normalize_domain(store_url) == 'www.westside.com'
+
+
+class TestBrowserExtractors:
+    """Test cases for extractors that render product pages in a browser."""
+
+    class RecordingLimiter:
+        """Rate limiter that records whether it is held."""
+
+        def __init__(self):
+            self.acquired = 0
+            self.held = False
+
+        async def __aenter__(self):
+            self.acquired += 1
+            self.held = True
+            return self
+
+        async def __aexit__(self, exc_type, exc_val, exc_tb):
+            self.held = False
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("extractor_cls", [
+        LittleBoxIndiaExtractor, FreakinsExtractor, SuqahExtractor
+    ])
+    async def test_page_loads_go_through_rate_limiter(self, extractor_cls, monkeypatch):
+        """Test every rendered page load is made while holding the rate limiter."""
+        monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+        limiter = self.RecordingLimiter()
+        extractor = extractor_cls(
+            store_url="test.com",
+            http_client=Mock(spec=HTTPClient),
+            rate_limiter=limiter
+        )
+        held_during_load = []
+
+        async def get_rendered_html(url):
+            held_during_load.append(limiter.held)
+            return '<html><body></body></html>'
+
+        extractor.browser = Mock()
+        extractor.browser.get_rendered_html = AsyncMock(side_effect=get_rendered_html)
+
+        with patch.object(extractor, 'extract_title', new_callable=AsyncMock, return_value='Title'):
+            await extractor.extract_size_chart('https://test.com/products/a')
+            await extractor.extract_size_chart('https://test.com/products/b')
+
+        assert held_during_load == [True, True]
+        assert limiter.acquired >= 2
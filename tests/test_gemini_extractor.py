@@ -0,0 +1,147 @@
+"""
+Tests for the Gemini size chart extractor.
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.models.size_chart import SizeChart
+from src.utils.gemini_extractor import GeminiBatcher, GeminiSizeChartExtractor
+from src.utils.http_client import HTTPClient
+
+CHART = SizeChart(headers=['Size'], rows=[{'Size': 'S'}])
+
+
+class FakeExtractor:
+    """Record Gemini calls and answer each image with its own bytes."""
+
+    def __init__(self, fail_batches=False):
+        self.fail_batches = fail_batches
+        self.batch_calls = []
+        self.single_calls = []
+
+    async def generate_content(self, image_data, mime_type):
+        self.single_calls.append(image_data)
+        return image_data
+
+    async def generate_batch(self, images):
+        self.batch_calls.append([data for data, _ in images])
+        if self.fail_batches:
+            raise RuntimeError("batch rejected")
+        return [data for data, _ in images]
+
+
+class TestGeminiBatcher:
+    """Test cases for GeminiBatcher."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_call(self):
+        """Test images submitted together go out as a single batch."""
+        extractor = FakeExtractor()
+        batcher = GeminiBatcher(extractor, max_batch=8, max_wait=0.01)
+
+        results = await asyncio.gather(
+            *[batcher.submit(bytes([i]), 'image/png') for i in range(3)]
+        )
+
+        assert results == [b'\x00', b'\x01', b'\x02']
+        assert extractor.batch_calls == [[b'\x00', b'\x01', b'\x02']]
+        assert extractor.single_calls == []
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_falls_back_to_single_calls(self):
+        """Test each image is retried alone when the batch call fails."""
+        extractor = FakeExtractor(fail_batches=True)
+        batcher = GeminiBatcher(extractor, max_batch=2, max_wait=1)
+
+        results = await asyncio.gather(
+            *[batcher.submit(bytes([i]), 'image/png') for i in range(2)]
+        )
+
+        assert results == [b'\x00', b'\x01']
+        assert len(extractor.batch_calls) == 1
+        assert extractor.single_calls == [b'\x00', b'\x01']
+
+
+class TestGeminiSizeChartExtractorCache:
+    """Test cases for the chart cache in GeminiSizeChartExtractor."""
+
+    @pytest.fixture
+    def extractor(self):
+        """Create an extractor whose downloads and Gemini calls are mocked."""
+        http_client = Mock(spec=HTTPClient)
+        http_client.get_bytes = AsyncMock(return_value=b'image')
+        extractor = GeminiSizeChartExtractor(api_key='test-key', http_client=http_client)
+        extractor._extract_from_bytes = AsyncMock(return_value=CHART)
+        return extractor
+
+    @pytest.mark.asyncio
+    async def test_same_url_is_downloaded_once(self, extractor):
+        """Test a repeated image URL is served from the cache."""
+        first = await extractor.extract_table('https://cdn.test/chart.png')
+        second = await extractor.extract_table('https://cdn.test/chart.png')
+
+        assert first is second is CHART
+        extractor.http_client.get_bytes.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_same_content_is_extracted_once(self, extractor):
+        """Test identical bytes under different URLs reach Gemini once."""
+        await extractor.extract_table('https://cdn.test/chart.png?v=1')
+        await extractor.extract_table('https://cdn.test/chart.png?v=2')
+
+        assert extractor.http_client.get_bytes.await_count == 2
+        extractor._extract_from_bytes.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_extraction(self, extractor):
+        """Test concurrent callers for one URL share the in-flight call."""
+        results = await asyncio.gather(
+            *[extractor.extract_table('https://cdn.test/chart.png') for _ in range(5)]
+        )
+
+        assert results == [CHART] * 5
+        extractor.http_client.get_bytes.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self, extractor):
+        """Test a failed download is retried on the next call instead of cached."""
+        extractor.http_client.get_bytes.side_effect = [ConnectionError('reset'), b'image']
+
+        assert await extractor.extract_table('https://cdn.test/chart.png') is None
+        assert await extractor.extract_table('https://cdn.test/chart.png') is CHART
+
+        assert extractor.http_client.get_bytes.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_gemini_errors_are_not_cached(self, extractor):
+        """Test a failed Gemini call is retried on the next call instead of cached."""
+        extractor._extract_from_bytes.side_effect = [RuntimeError('quota'), CHART]
+
+        assert await extractor.extract_table('https://cdn.test/chart.png') is None
+        assert await extractor.extract_table('https://cdn.test/chart.png') is CHART
+
+        assert extractor._extract_from_bytes.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_owner_does_not_cancel_waiters(self, extractor):
+        """Test a waiter still gets the chart when the caller that started it is cancelled."""
+        release = asyncio.Event()
+
+        async def get_bytes(url):
+            await release.wait()
+            return b'image'
+
+        extractor.http_client.get_bytes.side_effect = get_bytes
+        owner = asyncio.create_task(extractor.extract_table('https://cdn.test/chart.png'))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(extractor.extract_table('https://cdn.test/chart.png'))
+        await asyncio.sleep(0)
+
+        owner.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.wait_for(waiter, timeout=1) is CHART
+        assert owner.cancelled()
+        extractor.http_client.get_bytes.assert_awaited_once()
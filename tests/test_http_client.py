@@ -0,0 +1,160 @@
+"""
+Tests for the HTTP client.
+"""
+import pytest
+import pytest_asyncio
+from aiohttp import ClientResponseError, web
+
+from src.models.size_chart import ExtractionConfig
+from src.utils.http_client import HTTPClient
+from src.utils.response_cache import ResponseCache
+
+
+@pytest_asyncio.fixture
+async def server():
+    """Serve canned responses from a local aiohttp app, recording each hit."""
+    hits = []
+    responses = {}
+
+    async def handler(request):
+        hits.append(request.path)
+        queue = responses[request.path]
+        response = queue.pop(0) if len(queue) > 1 else queue[0]
+        # Callables build the response from the request, e.g. to check headers
+        return response(request) if callable(response) else response
+
+    app = web.Application()
+    app.router.add_get('/{tail:.*}', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    yield f'http://127.0.0.1:{port}', responses, hits
+
+    await runner.cleanup()
+
+
+class TestHTTPClient:
+    """Test cases for HTTPClient."""
+
+    @pytest.mark.asyncio
+    async def test_retries_after_429(self, server):
+        """Test a 429 is retried after the Retry-After delay."""
+        base_url, responses, hits = server
+        responses['/page'] = [
+            web.Response(status=429, headers={'Retry-After': '0'}),
+            web.Response(text='ok'),
+        ]
+
+        async with HTTPClient(max_retries=2, user_agent='test') as client:
+            assert await client.get(f'{base_url}/page') == 'ok'
+
+        assert hits == ['/page', '/page']
+
+    @pytest.mark.asyncio
+    async def test_default_config_makes_three_attempts(self, server):
+        """Test the configured retries give three attempts before failing."""
+        base_url, responses, hits = server
+        responses['/page'] = [lambda request: web.Response(status=503, headers={'Retry-After': '0'})]
+
+        max_retries = ExtractionConfig().max_retries
+        async with HTTPClient(max_retries=max_retries, user_agent='test') as client:
+            with pytest.raises(ClientResponseError):
+                await client.get(f'{base_url}/page')
+
+        assert hits == ['/page'] * 3
+
+    @pytest.mark.asyncio
+    async def test_stream_retries_before_body(self, server):
+        """Test opening a stream is retried after a 503."""
+        base_url, responses, hits = server
+        responses['/sitemap.xml'] = [
+            web.Response(status=503, headers={'Retry-After': '0'}),
+            web.Response(body=b'<urlset/>'),
+        ]
+
+        async with HTTPClient(max_retries=2, user_agent='test') as client:
+            async with client.stream(f'{base_url}/sitemap.xml') as body:
+                assert await body.read() == b'<urlset/>'
+
+        assert hits == ['/sitemap.xml', '/sitemap.xml']
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self, server):
+        """Test a 404 fails on the first attempt."""
+        base_url, responses, hits = server
+        responses['/missing'] = [web.Response(status=404)]
+
+        async with HTTPClient(max_retries=2, user_agent='test') as client:
+            with pytest.raises(ClientResponseError):
+                await client.get(f'{base_url}/missing')
+
+        assert hits == ['/missing']
+
+
+class TestResponseCache:
+    """Test cases for HTTPClient's on-disk response cache."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create a response cache in a temporary directory."""
+        cache = ResponseCache(str(tmp_path / 'cache.sqlite'))
+        yield cache
+        cache.close()
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_skips_network(self, server, cache):
+        """Test a response within its max-age is served from the cache."""
+        base_url, responses, hits = server
+        responses['/page'] = [
+            web.Response(text='v1', headers={'Cache-Control': 'max-age=60'}),
+            web.Response(text='v2'),
+        ]
+
+        async with HTTPClient(user_agent='test', cache=cache) as client:
+            assert await client.get(f'{base_url}/page') == 'v1'
+            assert await client.get(f'{base_url}/page') == 'v1'
+
+        assert hits == ['/page']
+
+    @pytest.mark.asyncio
+    async def test_no_store_is_not_cached(self, server, cache):
+        """Test Cache-Control: no-store responses are fetched every time."""
+        base_url, responses, hits = server
+        responses['/page'] = [
+            web.Response(text='v1', headers={'Cache-Control': 'no-store'}),
+            web.Response(text='v2', headers={'Cache-Control': 'no-store'}),
+        ]
+
+        async with HTTPClient(user_agent='test', cache=cache) as client:
+            assert await client.get(f'{base_url}/page') == 'v1'
+            assert await client.get(f'{base_url}/page') == 'v2'
+
+        assert hits == ['/page', '/page']
+        assert cache.get(f'{base_url}/page') is None
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_revalidates_with_etag(self, server, cache):
+        """Test a stale entry sends If-None-Match and a 304 refreshes it."""
+        base_url, responses, hits = server
+
+        def not_modified(request):
+            assert request.headers['If-None-Match'] == '"abc"'
+            return web.Response(status=304, headers={'Cache-Control': 'max-age=60'})
+
+        responses['/page'] = [
+            web.Response(text='v1', headers={'ETag': '"abc"', 'Cache-Control': 'max-age=0'}),
+            not_modified,
+        ]
+
+        async with HTTPClient(user_agent='test', cache=cache) as client:
+            assert await client.get(f'{base_url}/page') == 'v1'
+            assert not cache.get(f'{base_url}/page').fresh
+            assert await client.get(f'{base_url}/page') == 'v1'
+            # The 304's max-age made the entry fresh again, so no third request
+            assert await client.get(f'{base_url}/page') == 'v1'
+
+        assert hits == ['/page', '/page']
+        assert cache.get(f'{base_url}/page').fresh
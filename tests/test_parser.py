@@ -1,153 +1,418 @@
 """
 Tests for parser utilities.
 """
+import json
+import time
+
+import orjson
 import pytest
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+
+from typing import Union
 
 from src.utils.parser import SizeChartParser
 
+# lxml builds BeautifulSoup trees several times faster than html.parser
+PARSER = 'lxml'
+
+# Compiled once; BeautifulSoup tests use select_one, whose selectors soupsieve caches
+FIRST_TABLE = etree.XPath('(//table)[1]')
+
+THEAD_TABLE_HTML = """
+<table>
+    <thead>
+        <tr>
+            <th>Size</th>
+            <th>Chest</th>
+            <th>Waist</th>
+        </tr>
+    </thead>
+    <tbody>
+        <tr>
+            <td>S</td>
+            <td>36</td>
+            <td>30</td>
+        </tr>
+        <tr>
+            <td>M</td>
+            <td>38</td>
+            <td>32</td>
+        </tr>
+    </tbody>
+</table>
+"""
+
+PLAIN_TABLE_HTML = """
+<table>
+    <tr>
+        <th>Size</th>
+        <th>Length</th>
+    </tr>
+    <tr>
+        <td>Small</td>
+        <td>25"</td>
+    </tr>
+    <tr>
+        <td>Medium</td>
+        <td>27"</td>
+    </tr>
+</table>
+"""
+
+# Byte variants, as production callers get them from a response body
+THEAD_TABLE_HTML_BYTES = THEAD_TABLE_HTML.encode('utf-8')
+PLAIN_TABLE_HTML_BYTES = PLAIN_TABLE_HTML.encode('utf-8')
+
+DEFAULT_SPAN_TABLE_HTML = """
+<table>
+    <tr><th>Size</th><th>Chest</th></tr>
+    <tr><td>S</td><td><span class="default">90</span><span class="alt">35.4</span></td></tr>
+    <tr><td>M</td><td><span class="default">95</span><span class="alt">37.4</span></td></tr>
+</table>
+"""
+
+HEADER_CLASS_TABLE_HTML = """
+<table>
+    <tr><td class="header">Size</td><td class="header">Hip</td></tr>
+    <tr><td>M</td><td>40</td></tr>
+    <tr><td>L</td><td>42</td></tr>
+</table>
+"""
+
+RAGGED_TABLE_HTML = """
+<table>
+    <tr><th>Size</th><th>Chest</th></tr>
+    <tr><td>S</td><td>36</td><td>note</td></tr>
+    <tr><td>M</td></tr>
+</table>
+"""
+
+SIZE_CHART_PAGE_HTML = """
+<div>
+    <h2>Product Details</h2>
+    <table>
+        <tr><td>Material</td><td>Cotton</td></tr>
+    </table>
+
+    <h2>Size Chart</h2>
+    <table class="size-chart">
+        <tr>
+            <th>Size</th>
+            <th>Bust (in)</th>
+            <th>Waist (in)</th>
+        </tr>
+        <tr>
+            <td>XS</td>
+            <td>32</td>
+            <td>26</td>
+        </tr>
+        <tr>
+            <td>S</td>
+            <td>34</td>
+            <td>28</td>
+        </tr>
+    </table>
+</div>
+"""
+
+HINTED_TABLES_HTML = """
+<div>
+    <table>
+        <tr><th>Size</th><th>Chest</th></tr>
+        <tr><td>S</td><td>36</td></tr>
+        <tr><td>M</td><td>38</td></tr>
+    </table>
+    <div class="size-guide">
+        <table>
+            <tr><th>Size</th><th>Waist</th></tr>
+            <tr><td>S</td><td>30</td></tr>
+            <tr><td>M</td><td>32</td></tr>
+        </table>
+    </div>
+</div>
+"""
+
+CONTAINER_WORDS_HTML = """
+<div>
+    <div class="oversized-banner">
+        <table>
+            <tr><th>Size</th><th>Chest</th></tr>
+            <tr><td>S</td><td>36</td></tr>
+            <tr><td>M</td><td>38</td></tr>
+        </table>
+    </div>
+    <div id="KiwiSizingChart">
+        <table>
+            <tr><th>Size</th><th>Waist</th></tr>
+            <tr><td>S</td><td>30</td></tr>
+            <tr><td>M</td><td>32</td></tr>
+        </table>
+    </div>
+</div>
+"""
+
+
+def _big_page_html(rows: int = 1000, decoys: int = 20) -> str:
+    """A product page with one large size chart among many unrelated tables."""
+    decoy = '<table><tr><td>Material</td><td>Cotton</td></tr><tr><td>Care</td><td>Wash cold</td></tr></table>'
+    chart_rows = ''.join(
+        f'<tr><td>{size}</td><td>{30 + i % 40}</td><td>{24 + i % 30}</td></tr>'
+        for i, size in zip(range(rows), ['XS', 'S', 'M', 'L', 'XL'] * rows)
+    )
+    return (
+        '<html><body>' + decoy * decoys
+        + '<div class="size-chart"><table><tr><th>Size</th><th>Chest</th><th>Waist</th></tr>'
+        + chart_rows + '</table></div></body></html>'
+    )
+
+
+BIG_PAGE_HTML = _big_page_html()
+
+
+def _soup(html: Union[str, bytes], **kwargs) -> BeautifulSoup:
+    """Build a soup with PARSER; bytes are always declared UTF-8.
+
+    Without ``from_encoding`` BeautifulSoup has to guess the encoding of
+    byte input, which is slow and can guess wrong.
+    """
+    if isinstance(html, bytes):
+        kwargs.setdefault('from_encoding', 'utf-8')
+    return BeautifulSoup(html, PARSER, **kwargs)
+
+
+@pytest.fixture(scope="module")
+def table_soup(request):
+    """Parse the parametrized table HTML once for the module."""
+    return _soup(request.param)
+
+
+@pytest.fixture(scope="module")
+def size_chart_page_soup():
+    """Parse only the tables of a page with a size chart and an unrelated table."""
+    # The chart is marked by its own class, so the page's other tags can be skipped
+    return _soup(SIZE_CHART_PAGE_HTML, parse_only=SoupStrainer('table'))
+
+
+@pytest.fixture(scope="module")
+def hinted_tables_soup():
+    """Parse two charts, one inside a size-guide container once for the module."""
+    return _soup(HINTED_TABLES_HTML)
+
 
 class TestSizeChartParser:
     """Test cases for SizeChartParser."""
 
-    def test_clean_text(self):
+    @pytest.mark.parametrize("text,expected", [
+        ("  hello  world  ", "hello world"),
+        ("hello\n\tworld", "hello world"),
+        ("hello\u200bworld\u00a0", "hello world"),
+        ("", ""),
+        (None, ""),
+    ])
+    def test_clean_text(self, text, expected):
         """Test text cleaning functionality."""
-        assert SizeChartParser.clean_text("  hello  world  ") == "hello world"
-        assert SizeChartParser.clean_text("hello\n\tworld") == "hello world"
-        assert SizeChartParser.clean_text("") == ""
-        assert SizeChartParser.clean_text(None) == ""
-
-    def test_extract_table_data_with_thead(self):
-        """Test extracting data from table with thead."""
-        html = """
-        <table>
-            <thead>
-                <tr>
-                    <th>Size</th>
-                    <th>Chest</th>
-                    <th>Waist</th>
-                </tr>
-            </thead>
-            <tbody>
-                <tr>
-                    <td>S</td>
-                    <td>36</td>
-                    <td>30</td>
-                </tr>
-                <tr>
-                    <td>M</td>
-                    <td>38</td>
-                    <td>32</td>
-                </tr>
-            </tbody>
-        </table>
-        """
-        soup = BeautifulSoup(html, 'html.parser')
-        table = soup.find('table')
+        assert SizeChartParser.clean_text(text) == expected
+
+    @pytest.mark.parametrize("table_soup,expected_headers,expected_rows", [
+        pytest.param(html, headers, rows, id=f'{name}-{type(html).__name__}')
+        for name, headers, rows, variants in [
+            (
+                'with-thead',
+                ['Size', 'Chest', 'Waist'],
+                [
+                    {'Size': 'S', 'Chest': '36', 'Waist': '30'},
+                    {'Size': 'M', 'Chest': '38', 'Waist': '32'},
+                ],
+                (THEAD_TABLE_HTML, THEAD_TABLE_HTML_BYTES)
+            ),
+            (
+                'without-thead',
+                ['Size', 'Length'],
+                [
+                    {'Size': 'Small', 'Length': '25"'},
+                    {'Size': 'Medium', 'Length': '27"'},
+                ],
+                (PLAIN_TABLE_HTML, PLAIN_TABLE_HTML_BYTES)
+            ),
+        ]
+        for html in variants
+    ], indirect=['table_soup'])
+    def test_extract_table_data(self, table_soup, expected_headers, expected_rows):
+        """Test extracting data from tables with and without thead, as str or bytes."""
+        table = table_soup.select_one('table')
 
         headers, rows = SizeChartParser.extract_table_data(table)
 
-        assert headers == ['Size', 'Chest', 'Waist']
-        assert len(rows) == 2
-        assert rows[0] == {'Size': 'S', 'Chest': '36', 'Waist': '30'}
-        assert rows[1] == {'Size': 'M', 'Chest': '38', 'Waist': '32'}
+        assert headers == expected_headers
+        assert rows == expected_rows
 
-    def test_extract_table_data_without_thead(self):
-        """Test extracting data from table without thead."""
-        html = """
-        <table>
-            <tr>
-                <th>Size</th>
-                <th>Length</th>
-            </tr>
-            <tr>
-                <td>Small</td>
-                <td>25"</td>
-            </tr>
-            <tr>
-                <td>Medium</td>
-                <td>27"</td>
-            </tr>
-        </table>
-        """
-        soup = BeautifulSoup(html, 'html.parser')
-        table = soup.find('table')
+    @pytest.mark.parametrize("html", [
+        pytest.param(THEAD_TABLE_HTML, id='with-thead'),
+        pytest.param(PLAIN_TABLE_HTML, id='without-thead'),
+        pytest.param(DEFAULT_SPAN_TABLE_HTML, id='default-span'),
+        pytest.param(HEADER_CLASS_TABLE_HTML, id='header-class'),
+        pytest.param(RAGGED_TABLE_HTML, id='ragged-rows'),
+    ])
+    def test_extract_table_data_backends_agree(self, html):
+        """Test the lxml and BeautifulSoup backends extract identical data."""
+        bs4_table = _soup(html).select_one('table')
+        lxml_table = FIRST_TABLE(SizeChartParser.parse_html(html))[0]
+
+        bs4_data = SizeChartParser.extract_table_data(bs4_table)
+        lxml_data = SizeChartParser.extract_table_data_lxml(lxml_table)
+
+        assert lxml_data == bs4_data
+        assert lxml_data[1]
+
+    def test_extract_table_data_prefers_default_span(self):
+        """Test measurement cells use the default span and gain a CM unit."""
+        table = FIRST_TABLE(SizeChartParser.parse_html(DEFAULT_SPAN_TABLE_HTML))[0]
 
         headers, rows = SizeChartParser.extract_table_data(table)
 
-        assert headers == ['Size', 'Length']
-        assert len(rows) == 2
-        assert rows[0] == {'Size': 'Small', 'Length': '25"'}
+        assert headers == ['Size', 'Chest']
+        assert rows == [{'Size': 'S', 'Chest': '90 CM'}, {'Size': 'M', 'Chest': '95 CM'}]
 
-    def test_find_size_charts(self):
-        """Test finding size charts in HTML."""
-        html = """
-        <div>
-            <h2>Product Details</h2>
-            <table>
-                <tr><td>Material</td><td>Cotton</td></tr>
-            </table>
-            
-            <h2>Size Chart</h2>
-            <table class="size-chart">
-                <tr>
-                    <th>Size</th>
-                    <th>Bust (in)</th>
-                    <th>Waist (in)</th>
-                </tr>
-                <tr>
-                    <td>XS</td>
-                    <td>32</td>
-                    <td>26</td>
-                </tr>
-                <tr>
-                    <td>S</td>
-                    <td>34</td>
-                    <td>28</td>
-                </tr>
-            </table>
-        </div>
-        """
-        soup = BeautifulSoup(html, 'html.parser')
+    def test_extract_table_data_maps_cells_by_position(self):
+        """Test cells beyond the headers are dropped and short rows stay short."""
+        table = _soup(RAGGED_TABLE_HTML).select_one('table')
 
-        potential_charts = SizeChartParser.find_size_charts(soup)
+        headers, rows = SizeChartParser.extract_table_data(table)
+
+        assert headers == ['Size', 'Chest']
+        assert rows == [{'Size': 'S', 'Chest': '36'}, {'Size': 'M'}]
+
+    def test_extract_table_data_from_bytes(self):
+        """Test UTF-8 byte input decodes non-ASCII cells correctly."""
+        html = (
+            '<table><tr><th>Größe</th><th>Länge</th></tr>'
+            '<tr><td>S</td><td>70–72</td></tr></table>'
+        ).encode('utf-8')
+        table = _soup(html).select_one('table')
+
+        headers, rows = SizeChartParser.extract_table_data(table)
+
+        assert headers == ['Größe', 'Länge']
+        assert rows == [{'Größe': 'S', 'Länge': '70–72'}]
+
+    def test_find_size_charts(self, size_chart_page_soup):
+        """Test finding size charts in HTML."""
+        potential_charts = SizeChartParser.find_size_charts(size_chart_page_soup)
 
         assert len(potential_charts) >= 1
         # The size chart table should have higher confidence
         best_table, confidence = potential_charts[0]
-        assert 'size-chart' in str(best_table.get('class', []))
+        assert 'size-chart' in best_table.get('class', '').split()
         assert confidence > 0.5
 
-    def test_parse_size_chart_from_json(self):
+        # The discovered table feeds extraction directly, with no second parse
+        headers, rows = SizeChartParser.extract_table_data(best_table)
+        assert headers == ['Size', 'Bust (in)', 'Waist (in)']
+        assert rows == [
+            {'Size': 'XS', 'Bust (in)': '32', 'Waist (in)': '26'},
+            {'Size': 'S', 'Bust (in)': '34', 'Waist (in)': '28'},
+        ]
+
+    def test_find_size_charts_class_list_type(self, size_chart_page_soup):
+        """Test class is a list on BeautifulSoup tags but a string on returned tables."""
+        soup_table = size_chart_page_soup.select_one('table.size-chart')
+        assert soup_table['class'] == ['size-chart']
+
+        best_table, _ = SizeChartParser.find_size_charts(size_chart_page_soup)[0]
+        # Discovery returns lxml elements, whose multi-valued attributes stay strings
+        assert best_table.get('class') == 'size-chart'
+
+    def test_iter_size_charts_scores_hinted_tables_first(self, hinted_tables_soup):
+        """Test tables inside size-related containers are yielded first."""
+        table, confidence = next(SizeChartParser.iter_size_charts(hinted_tables_soup))
+
+        headers, _ = SizeChartParser.extract_table_data(table)
+        assert headers == ['Size', 'Waist']
+        assert confidence > 0.3
+
+    def test_iter_size_charts_matches_container_words_not_substrings(self):
+        """Test container hints match whole class/id words, including camelCase."""
+        tree = SizeChartParser.parse_html(CONTAINER_WORDS_HTML)
+
+        charts = list(SizeChartParser.iter_size_charts(tree))
+
+        headers, _ = SizeChartParser.extract_table_data(charts[0][0])
+        assert headers == ['Size', 'Waist']
+        assert charts[0][1] > charts[1][1]
+
+    @pytest.mark.parametrize("attr", [
+        'class="sizechart"',
+        'id="productsizeguide"',
+        'class="sizingtable"',
+        'class="product__size-chart"',
+        'id="KiwiSizingChart"',
+    ])
+    def test_iter_size_charts_scores_compound_container_names(self, attr):
+        """Test run-together container names still earn the container bonus."""
+        table = (
+            '<table><tr><th>Size</th><th>Chest</th></tr>'
+            '<tr><td>S</td><td>36</td></tr><tr><td>M</td><td>38</td></tr></table>'
+        )
+        plain = SizeChartParser.parse_html(f'<div class="product">{table}</div>')
+        hinted = SizeChartParser.parse_html(f'<div {attr}>{table}</div>')
+
+        (_, plain_confidence), = SizeChartParser.iter_size_charts(plain)
+        (_, hinted_confidence), = SizeChartParser.iter_size_charts(hinted)
+
+        assert hinted_confidence == pytest.approx(plain_confidence + 0.3)
+
+    @pytest.mark.parametrize("loads", [json.loads, orjson.loads], ids=['json', 'orjson'])
+    def test_parse_size_chart_from_json(self, loads):
         """Test parsing size chart from JSON data."""
         # Test direct format
-        data = {
-            'sizeChart': {
-                'headers': ['Size', 'Width'],
-                'rows': [
-                    {'Size': 'S', 'Width': '18'},
-                    {'Size': 'M', 'Width': '20'}
-                ]
-            }
-        }
+        data = loads(
+            '{"sizeChart": {"headers": ["Size", "Width"],'
+            ' "rows": [{"Size": "S", "Width": "18"}, {"Size": "M", "Width": "20"}]}}'
+        )
 
         result = SizeChartParser.parse_size_chart_from_json(data)
         assert result is not None
         headers, rows = result
         assert headers == ['Size', 'Width']
-        assert len(rows) == 2
+        assert rows == [{'Size': 'S', 'Width': '18'}, {'Size': 'M', 'Width': '20'}]
 
         # Test array format
-        data = {
-            'sizing': [
-                {'size': 'Small', 'chest': 36},
-                {'size': 'Medium', 'chest': 38}
-            ]
-        }
+        data = loads(
+            '{"sizing": [{"size": "Small", "chest": 36}, {"size": "Medium", "chest": 38}]}'
+        )
 
         result = SizeChartParser.parse_size_chart_from_json(data)
         assert result is not None
         headers, rows = result
         assert 'size' in headers
         assert 'chest' in headers
-        assert len(rows) == 2
+        assert rows == [{'size': 'Small', 'chest': 36}, {'size': 'Medium', 'chest': 38}]
+
+    def test_parse_size_chart_numeric_bulk(self):
+        """Test a 10k-row array payload is returned as-is, values untouched."""
+        sizing = [
+            {'size': f'S{i}', 'chest': 30 + i % 40, 'waist': f'{24 + i % 30}.5'}
+            for i in range(10_000)
+        ]
+
+        headers, rows = SizeChartParser.parse_size_chart_from_json({'sizing': sizing})
+
+        assert headers == ['size', 'chest', 'waist']
+        # No per-cell conversion: the payload's rows come back unchanged
+        assert rows is sizing
+        assert rows[9_999] == {'size': 'S9999', 'chest': 69, 'waist': '33.5'}
+
+    @pytest.mark.slow
+    def test_find_size_charts_perf(self):
+        """Test a 1000-row chart among decoy tables is found within a time budget."""
+        soup = _soup(BIG_PAGE_HTML)
+
+        start = time.perf_counter()
+        potential_charts = SizeChartParser.find_size_charts(soup)
+        elapsed = time.perf_counter() - start
+
+        headers, rows = SizeChartParser.extract_table_data(potential_charts[0][0])
+        assert headers == ['Size', 'Chest', 'Waist']
+        assert len(rows) == 1000
+        assert elapsed < 1.0
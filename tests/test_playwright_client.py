@@ -0,0 +1,74 @@
+"""
+Tests for the Playwright rendering client.
+"""
+import asyncio
+import sys
+import types
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.utils.playwright_client import PlaywrightClient
+
+
+@pytest.fixture
+def fake_playwright(monkeypatch):
+    """Stand in for playwright.async_api, which is an optional dependency."""
+    module = types.ModuleType('playwright.async_api')
+    module.TimeoutError = type('TimeoutError', (Exception,), {})
+    monkeypatch.setitem(sys.modules, 'playwright', types.ModuleType('playwright'))
+    monkeypatch.setitem(sys.modules, 'playwright.async_api', module)
+    return module
+
+
+class TestPlaywrightClient:
+    """Test cases for PlaywrightClient."""
+
+    @pytest.mark.asyncio
+    async def test_context_returns_to_pool_when_new_page_fails(self, fake_playwright):
+        """Test a failed new_page() does not leak the context slot."""
+        context = Mock()
+        context.new_page = AsyncMock(side_effect=RuntimeError('browser crashed'))
+        client = PlaywrightClient(pool_size=1)
+        client._contexts = asyncio.Queue()
+        client._contexts.put_nowait(context)
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await asyncio.wait_for(client.get_rendered_html('https://test.com'), timeout=1)
+
+        assert client._contexts.qsize() == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_launch_stops_playwright(self, fake_playwright):
+        """Test the Playwright driver is stopped when the browser fails to launch."""
+        playwright = Mock()
+        playwright.stop = AsyncMock()
+        playwright.chromium.launch = AsyncMock(side_effect=RuntimeError('no chromium'))
+        fake_playwright.async_playwright = Mock(
+            return_value=Mock(start=AsyncMock(return_value=playwright))
+        )
+        client = PlaywrightClient()
+
+        with pytest.raises(RuntimeError):
+            await client.get_rendered_html('https://test.com')
+
+        playwright.stop.assert_awaited_once()
+        assert client._playwright is None
+
+    @pytest.mark.asyncio
+    async def test_timeout_applies_to_page(self, fake_playwright):
+        """Test ``timeout`` becomes the page's default timeout."""
+        page = Mock()
+        page.goto = AsyncMock()
+        page.wait_for_load_state = AsyncMock()
+        page.content = AsyncMock(return_value='<html></html>')
+        page.close = AsyncMock()
+        context = Mock()
+        context.new_page = AsyncMock(return_value=page)
+        client = PlaywrightClient(timeout=12)
+        client._contexts = asyncio.Queue()
+        client._contexts.put_nowait(context)
+
+        assert await client.get_rendered_html('https://test.com') == '<html></html>'
+
+        page.set_default_timeout.assert_called_once_with(12000)
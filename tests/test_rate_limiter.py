@@ -0,0 +1,33 @@
+"""
+Tests for the rate limiter.
+"""
+import asyncio
+import pytest
+
+from src.utils.rate_limiter import RateLimiter
+
+
+class TestRateLimiter:
+    """Test cases for RateLimiter."""
+
+    @pytest.mark.asyncio
+    async def test_burst_passes_without_waiting(self):
+        """Test requests within the burst are not delayed."""
+        limiter = RateLimiter(requests_per_second=0.1, burst=3)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        await asyncio.gather(*[limiter.acquire() for _ in range(3)])
+
+        assert loop.time() - start < 0.05
+
+    @pytest.mark.asyncio
+    async def test_requests_beyond_burst_are_spaced(self):
+        """Test concurrent requests past the burst wait for refilled tokens."""
+        limiter = RateLimiter(requests_per_second=20.0, burst=1)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        await asyncio.gather(*[limiter.acquire() for _ in range(4)])
+
+        assert loop.time() - start >= 0.15
@@ -0,0 +1,117 @@
+"""
+Tests for the Selenium driver pool.
+"""
+import asyncio
+import pytest
+from unittest.mock import Mock
+
+from src.utils.selenium_client import SeleniumDriverPool
+
+
+class FakeDriverFactory:
+    """Create mock drivers, optionally failing the first few creations."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.drivers = []
+
+    def __call__(self):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError('chrome failed to start')
+        driver = Mock()
+        self.drivers.append(driver)
+        return driver
+
+
+class TestSeleniumDriverPool:
+    """Test cases for SeleniumDriverPool."""
+
+    @pytest.mark.asyncio
+    async def test_drivers_are_created_lazily_up_to_size(self):
+        """Test at most ``size`` drivers exist and extra callers wait."""
+        factory = FakeDriverFactory()
+        pool = SeleniumDriverPool(factory, size=2)
+        assert factory.drivers == []
+
+        first = await pool.acquire()
+        second = await pool.acquire()
+        waiter = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0.01)
+
+        assert not waiter.done()
+        assert len(factory.drivers) == 2
+
+        await pool.release(first)
+        assert await asyncio.wait_for(waiter, timeout=1) is first
+        assert len(factory.drivers) == 2
+        await pool.release(second)
+
+    @pytest.mark.asyncio
+    async def test_sequential_use_starts_one_driver(self):
+        """Test an idle driver is reused before another one is created."""
+        factory = FakeDriverFactory()
+        pool = SeleniumDriverPool(factory, size=5)
+
+        for _ in range(5):
+            await pool.release(await pool.acquire())
+
+        assert len(factory.drivers) == 1
+
+    @pytest.mark.asyncio
+    async def test_released_driver_is_reset_and_reused(self):
+        """Test a healthy driver has its cookies cleared and goes back to the pool."""
+        factory = FakeDriverFactory()
+        pool = SeleniumDriverPool(factory, size=1)
+
+        driver = await pool.acquire()
+        await pool.release(driver)
+
+        driver.delete_all_cookies.assert_called_once()
+        assert await pool.acquire() is driver
+
+    @pytest.mark.asyncio
+    async def test_unhealthy_driver_is_replaced(self):
+        """Test a driver failing its reset is quit and a new one takes its slot."""
+        factory = FakeDriverFactory()
+        pool = SeleniumDriverPool(factory, size=1)
+
+        broken = await pool.acquire()
+        broken.delete_all_cookies.side_effect = RuntimeError('session deleted')
+        await pool.release(broken)
+
+        replacement = await asyncio.wait_for(pool.acquire(), timeout=1)
+        assert replacement is not broken
+        broken.quit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_creation_does_not_shrink_pool(self):
+        """Test the slot of a driver that failed to start is available again."""
+        factory = FakeDriverFactory(failures=1)
+        pool = SeleniumDriverPool(factory, size=1)
+
+        with pytest.raises(RuntimeError):
+            await pool.acquire()
+
+        driver = await asyncio.wait_for(pool.acquire(), timeout=1)
+        assert driver is factory.drivers[0]
+
+    @pytest.mark.asyncio
+    async def test_close_quits_drivers_and_reseeds_pool(self):
+        """Test close() quits every driver and the pool can start fresh ones."""
+        factory = FakeDriverFactory()
+        pool = SeleniumDriverPool(factory, size=2)
+        first = await pool.acquire()
+        second = await pool.acquire()
+        await pool.release(first)
+
+        await pool.close()
+
+        first.quit.assert_called_once()
+        second.quit.assert_called_once()
+        fresh = await asyncio.wait_for(pool.acquire(), timeout=1)
+        assert fresh not in (first, second)
+
+        # A driver borrowed across close() is dropped, not returned to the pool
+        await pool.release(second)
+        assert await asyncio.wait_for(pool.acquire(), timeout=1) is not second
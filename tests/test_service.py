@@ -0,0 +1,157 @@
+"""
+Tests for the extraction service.
+"""
+import asyncio
+import json
+import sqlite3
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.extractors.factory import ExtractorFactory
+from src.models.size_chart import (
+    ExtractionConfig, Product, SizeChart, StoreResult, StoreSummary
+)
+from src.service import PREWARM_TIMEOUT, SizeChartExtractorService
+
+
+class TestSizeChartExtractorService:
+    """Test cases for SizeChartExtractorService."""
+
+    @pytest.fixture
+    def service(self):
+        """Create a service allowing several stores at once."""
+        return SizeChartExtractorService(ExtractionConfig(concurrent_requests=3))
+
+    @pytest.mark.asyncio
+    async def test_extract_stores_runs_stores_concurrently(self, service):
+        """Test stores overlap and each gets its own rate limiter."""
+        store_urls = ['a.com', 'b.com', 'c.com']
+        started = []
+        all_started = asyncio.Event()
+        rate_limiters = []
+
+        class FakeExtractor:
+            def __init__(self, store_url, rate_limiter):
+                self.store_url = store_url
+                rate_limiters.append(rate_limiter)
+
+            async def extract_all(self):
+                started.append(self.store_url)
+                if len(started) == len(store_urls):
+                    all_started.set()
+                # Only returns if every store is running at the same time
+                await asyncio.wait_for(all_started.wait(), timeout=1)
+                return StoreResult(store_name=self.store_url)
+
+        def create_extractor(store_url, rate_limiter, **kwargs):
+            return FakeExtractor(store_url, rate_limiter)
+
+        with patch.object(ExtractorFactory, 'create_extractor', side_effect=create_extractor):
+            async with service:
+                results = await service.extract_stores(store_urls)
+
+        assert sorted(r.store_name for r in results) == store_urls
+        assert all(not r.errors for r in results)
+        assert len({id(limiter) for limiter in rate_limiters}) == len(store_urls)
+
+    @pytest.mark.asyncio
+    async def test_iter_stores_bounds_in_flight_stores(self):
+        """Test no more than concurrent_requests stores run at once."""
+        service = SizeChartExtractorService(ExtractionConfig(concurrent_requests=2))
+        store_urls = [f'store{i}.com' for i in range(6)]
+        in_flight = 0
+        peak = 0
+
+        async def extract_store(store_url):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return StoreResult(store_name=store_url)
+
+        with patch.object(service, 'extract_store', side_effect=extract_store):
+            async with service:
+                results = [result async for result in service.iter_stores(store_urls)]
+
+        assert sorted(r.store_name for r in results) == sorted(store_urls)
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_prewarm_heads_each_host_once_with_short_timeout(self, service):
+        """Test prewarm sends one short HEAD per host and ignores failures."""
+        service.http_client.head = AsyncMock(side_effect=[200, asyncio.TimeoutError()])
+
+        await service.prewarm(['a.com', 'https://www.a.com/', 'B.com'])
+
+        calls = service.http_client.head.await_args_list
+        assert sorted(call.args[0] for call in calls) == [
+            'https://www.a.com/', 'https://www.b.com/'
+        ]
+        assert all(call.kwargs['timeout'] is PREWARM_TIMEOUT for call in calls)
+        assert PREWARM_TIMEOUT.total <= 3
+
+    def test_save_results_writes_json_and_jsonl(self, service, tmp_path):
+        """Test save_results writes an indented array or one store per line."""
+        results = [
+            StoreResult(store_name='a.com', extraction_date='2024-01-01'),
+            StoreResult(store_name='b.com', errors=['boom']),
+        ]
+
+        service.save_results(results, str(tmp_path / 'out.json'))
+        service.save_results(results, str(tmp_path / 'out.jsonl'))
+
+        stores = json.loads((tmp_path / 'out.json').read_text(encoding='utf-8'))
+        lines = (tmp_path / 'out.jsonl').read_text(encoding='utf-8').splitlines()
+        assert [json.loads(line) for line in lines] == stores
+        assert [s['store_name'] for s in stores] == ['a.com', 'b.com']
+        assert stores[1]['errors'] == ['boom']
+
+    @pytest.mark.asyncio
+    async def test_run_writes_results_and_returns_summaries(self, service, tmp_path):
+        """Test run() writes full results but only keeps per-store counts."""
+        product = Product(
+            product_title='Tee',
+            product_url='https://a.com/products/tee',
+            size_chart=SizeChart(headers=['Size'], rows=[{'Size': 'S'}])
+        )
+
+        async def extract_store(store_url):
+            if store_url == 'b.com':
+                raise RuntimeError('boom')
+            return StoreResult(store_name=store_url, products=[product])
+
+        with patch.object(service, 'extract_store', side_effect=extract_store), \
+                patch.object(service, 'prewarm'):
+            summaries = await service.run(['a.com', 'b.com'], str(tmp_path / 'out.json'))
+
+        assert all(isinstance(s, StoreSummary) for s in summaries)
+        assert sorted((s.store_name, s.product_count, s.error_count) for s in summaries) == [
+            ('a.com', 1, 0), ('b.com', 0, 1)
+        ]
+        stores = json.loads((tmp_path / 'out.json').read_text(encoding='utf-8'))
+        assert {s['store_name']: len(s['products']) for s in stores} == {'a.com': 1, 'b.com': 0}
+
+    @pytest.mark.asyncio
+    async def test_run_closes_response_cache(self, tmp_path):
+        """Test run() closes the SQLite response cache when it finishes."""
+        config = ExtractionConfig(http_cache=str(tmp_path / 'cache.sqlite'))
+        service = SizeChartExtractorService(config)
+
+        await service.run([], str(tmp_path / 'out.json'))
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            service.cache.get('https://a.com/')
+
+    @pytest.mark.asyncio
+    async def test_context_manager_closes_session_and_cache(self, tmp_path):
+        """Test leaving the service closes its HTTP session and response cache."""
+        config = ExtractionConfig(http_cache=str(tmp_path / 'cache.sqlite'))
+
+        async with SizeChartExtractorService(config) as service:
+            session = service.http_client._get_session()
+
+        assert session.closed
+        assert service.http_client.session is None
+        with pytest.raises(sqlite3.ProgrammingError):
+            service.cache.get('https://a.com/')